@@ -0,0 +1,70 @@
+"""
+Отчёт по категориям (средняя цена, остаток, стоимость остатков):
+циклы по объектам Product, накопленные агрегаты Category и одна
+группировка pandas по таблице catalog_to_dataframe.
+
+Запуск: python -m benchmarks.bench_dataframe [N ...]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records
+from src.category import Category, CategoryIterator
+from src.dataframe import catalog_to_dataframe, category_report
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+
+def build_categories(size: int, count: int = 100) -> list[Category]:
+    products = Product.from_records(product_records(size))
+    step = -(-size // count)
+    return [
+        Category(f"Категория {i}", "Описание", products[i * step : (i + 1) * step])
+        for i in range(count)
+    ]
+
+
+def looped_report(categories):
+    report = {}
+    for category in categories:
+        products = list(CategoryIterator(category))
+        total = sum(p.quantity for p in products)
+        middle = sum(p.price for p in products) / len(products)
+        stock = sum(p.price * p.quantity for p in products)
+        report[category.name] = (middle, total, stock)
+    return report
+
+
+def aggregate_report(categories):
+    # Средняя цена и остаток за O(1), стоимость остатков - всё равно цикл
+    return {
+        category.name: (
+            category.middle_price(),
+            category.calculate_total(),
+            sum(p.price * p.quantity for p in CategoryIterator(category)),
+        )
+        for category in categories
+    }
+
+
+def main(sizes):
+    print(
+        f"{'товаров':>10}{'цикл, с':>10}{'агрегаты, с':>14}"
+        f"{'в DataFrame, с':>16}{'groupby, с':>12}"
+    )
+    with use_backend(SilentBackend()):
+        for size in sizes:
+            categories = build_categories(size)
+            looped = best_time(lambda: looped_report(categories))
+            aggregated = best_time(lambda: aggregate_report(categories))
+            convert = best_time(lambda: catalog_to_dataframe(categories))
+            frame = catalog_to_dataframe(categories)
+            grouped = best_time(lambda: category_report(frame))
+            print(
+                f"{size:>10}{looped:>10.3f}{aggregated:>14.3f}"
+                f"{convert:>16.3f}{grouped:>12.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,49 @@
+"""
+Создание товаров: поштучный конструктор Product против пакетных
+Product.from_records и Product.from_columns, а также from_records для
+каталога из товаров трёх типов (поле "type").
+
+Запуск: python -m benchmarks.bench_from_records [N ...]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records, typed_product_records
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+
+def per_object(records):
+    return [
+        Product(r["name"], r["description"], r["price"], r["quantity"])
+        for r in records
+    ]
+
+
+def main(sizes):
+    print(
+        f"{'записей':>10}{'Product(), с':>15}"
+        f"{'from_records, с':>18}{'from_columns, с':>18}{'с типами, с':>15}"
+    )
+    with use_backend(SilentBackend()):
+        for size in sizes:
+            records = product_records(size)
+            columns = (
+                [r["name"] for r in records],
+                [r["description"] for r in records],
+                [r["price"] for r in records],
+                [r["quantity"] for r in records],
+            )
+            single = best_time(lambda: per_object(records))
+            bulk = best_time(lambda: Product.from_records(records))
+            by_columns = best_time(lambda: Product.from_columns(*columns))
+            typed_records = typed_product_records(size)
+            typed = best_time(lambda: Product.from_records(typed_records))
+            print(
+                f"{size:>10}{single:>15.3f}{bulk:>18.3f}{by_columns:>18.3f}"
+                f"{typed:>15.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
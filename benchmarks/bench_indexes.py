@@ -0,0 +1,44 @@
+"""
+Диапазонные и top-k запросы к категории: линейный проход против
+отсортированных индексов по цене и количеству.
+
+Запуск: python -m benchmarks.bench_indexes [N]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records
+from src.category import Category
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+
+def run_queries(category: Category):
+    category.products_in_price_range(5000, 5100)
+    category.products_in_quantity_range(high=4)
+    category.top_by_price(10)
+    category.top_by_quantity(10, highest=False)
+
+
+def main(count: int = 1_000_000):
+    with use_backend(SilentBackend()):
+        products = Product.from_records(product_records(count))
+        category = Category("Каталог", "Синтетический каталог", products)
+
+        scan = best_time(lambda: run_queries(category))
+        build = best_time(category.enable_indexes, repeat=1)
+        indexed = best_time(lambda: run_queries(category))
+        changes = best_time(
+            lambda: [setattr(p, "quantity", p.quantity + 1) for p in products[:1000]],
+            repeat=1,
+        )
+
+    print(f"товаров: {count}")
+    print(f"запросы без индексов:    {scan:.4f} с")
+    print(f"построение индексов:     {build:.4f} с")
+    print(f"запросы с индексами:     {indexed:.4f} с")
+    print(f"1000 изменений остатка:  {changes:.4f} с")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
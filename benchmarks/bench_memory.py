@@ -0,0 +1,79 @@
+"""
+Расход памяти на один продукт: классы со слотами против хранения в __dict__.
+
+Запуск: python -m benchmarks.bench_memory [количество продуктов]
+"""
+
+import sys
+import tracemalloc
+
+from src.logger import SilentBackend, use_backend
+from src.product import LawnGrass, Product, Smartphone
+
+
+class DictProduct:
+    """Копия прежнего Product: атрибуты хранятся в __dict__ экземпляра"""
+
+    def __init__(self, name, description, price, quantity):
+        self.name = name
+        self.description = description
+        self._BaseProduct__price = float(price)
+        self._Product__price = float(price)
+        self.quantity = quantity
+
+
+class DictSmartphone(DictProduct):
+    def __init__(
+        self, name, description, price, quantity, efficiency, model, memory, color
+    ):
+        super().__init__(name, description, price, quantity)
+        self.efficiency = efficiency
+        self.model = model
+        self.memory = memory
+        self.color = color
+
+
+class DictLawnGrass(DictProduct):
+    def __init__(
+        self, name, description, price, quantity, country, germination_period, color
+    ):
+        super().__init__(name, description, price, quantity)
+        self.country = country
+        self.germination_period = germination_period
+        self.color = color
+
+
+def bytes_per_object(factory, args_list) -> float:
+    """Средний прирост памяти на один объект, созданный factory(*args)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(*args) for args in args_list]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Память под сам список не относится к объектам
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def main(count: int = 100_000):
+    # Строки и числа создаются заранее, чтобы измерять только сами объекты
+    names = [f"Товар {i}" for i in range(count)]
+    prices = [float(i + 1) for i in range(count)]
+    base = [(name, "Описание", price, 10) for name, price in zip(names, prices)]
+    smartphones = [args + (8.5, "Модель", 256, "Черный") for args in base]
+    lawn_grass = [args + ("Россия", 30, "Зеленый") for args in base]
+
+    cases = [
+        ("Product", DictProduct, Product, base),
+        ("Smartphone", DictSmartphone, Smartphone, smartphones),
+        ("LawnGrass", DictLawnGrass, LawnGrass, lawn_grass),
+    ]
+    print(f"{'класс':<12}{'__dict__, байт':>16}{'__slots__, байт':>17}")
+    with use_backend(SilentBackend()):
+        for title, before_cls, after_cls, args_list in cases:
+            before = bytes_per_object(before_cls, args_list)
+            after = bytes_per_object(after_cls, args_list)
+            print(f"{title:<12}{before:>16.1f}{after:>17.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
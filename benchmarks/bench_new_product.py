@@ -0,0 +1,51 @@
+"""
+Объединение дублей в Product.new_product: поиск перебором списка против
+словаря-индекса {название: товар}.
+
+Запуск: python -m benchmarks.bench_new_product [N ...]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+# Перебор списка квадратичен, поэтому для больших N он не запускается
+LIST_LIMIT = 20_000
+
+
+def merge_with_list(records):
+    products = []
+    for record in records:
+        product = Product.new_product(record, products)
+        # Все количества положительные: у объединённого товара остаток больше
+        if product.quantity == record["quantity"]:
+            products.append(product)
+    return products
+
+
+def merge_with_index(records):
+    index = {}
+    for record in records:
+        Product.new_product(record, index)
+    return index
+
+
+def main(sizes):
+    print(f"{'записей':>10}{'список, с':>14}{'индекс, с':>14}")
+    with use_backend(SilentBackend()):
+        for size in sizes:
+            # Половина записей - дубли уже встречавшихся товаров
+            records = product_records(size, unique=size // 2)
+            indexed = best_time(lambda: merge_with_index(records), repeat=1)
+            if size <= LIST_LIMIT:
+                seconds = best_time(lambda: merge_with_list(records), repeat=1)
+                listed = f"{seconds:>14.3f}"
+            else:
+                listed = f"{'-':>14}"
+            print(f"{size:>10}{listed}{indexed:>14.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,64 @@
+"""
+Заказ из многих строк: объект Order на каждую строку против одного
+Order с add_product и add_products, а также расчёт итоговой суммы.
+
+Запуск: python -m benchmarks.bench_order_lines [строк ...]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records
+from src.category import Order
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+
+def per_line(requests):
+    return [Order(product, quantity) for product, quantity in requests]
+
+
+def one_by_one(requests):
+    order = Order()
+    for product, quantity in requests:
+        order.add_product(product, quantity)
+    return order
+
+
+def bulk(requests):
+    order = Order()
+    order.add_products(requests)
+    return order
+
+
+def main(sizes):
+    print(
+        f"{'строк':>10}{'Order на строку, с':>21}{'add_product, с':>17}"
+        f"{'add_products, с':>18}{'сумма: список, мкс':>21}{'сумма: Order, мкс':>20}"
+    )
+    with use_backend(SilentBackend()):
+        for size in sizes:
+            records = product_records(size)
+            for record in records:
+                # Остатка хватает на все повторы измерений
+                record["quantity"] = 100
+            products = Product.from_records(records)
+            requests = [(product, 1 + i % 3) for i, product in enumerate(products)]
+
+            single = best_time(lambda: per_line(requests))
+            added = best_time(lambda: one_by_one(requests))
+            batched = best_time(lambda: bulk(requests))
+
+            orders = per_line(requests)
+            order = bulk(requests)
+            total_list = best_time(
+                lambda: sum(item.calculate_total() for item in orders)
+            )
+            total_order = best_time(order.calculate_total)
+            print(
+                f"{size:>10}{single:>21.3f}{added:>17.3f}{batched:>18.3f}"
+                f"{total_list * 1e6:>21.1f}{total_order * 1e6:>20.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,36 @@
+"""
+Оформление заказов: объект Order на каждую строку против пакета
+place_orders.
+
+Запуск: python -m benchmarks.bench_orders [строк] [товаров]
+"""
+
+import sys
+
+from benchmarks.common import best_time, product_records
+from src.category import Category, Order, place_orders
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+
+
+def main(lines: int = 100_000, products_count: int = 1_000):
+    with use_backend(SilentBackend()):
+        records = product_records(products_count)
+        for record in records:
+            # Остатка хватает на все повторы измерений
+            record["quantity"] = lines * 10
+        products = Product.from_records(records)
+        Category("Каталог", "Синтетический каталог", products)
+        requests = [(products[i % products_count], 1 + i % 3) for i in range(lines)]
+
+        single = best_time(lambda: [Order(p, q) for p, q in requests])
+        batch = best_time(lambda: place_orders(requests))
+
+    print(f"строк: {lines}, товаров: {products_count}")
+    print(f"Order на строку: {single:.3f} с ({lines / single:,.0f} строк/с)")
+    print(f"place_orders:    {batch:.3f} с ({lines / batch:,.0f} строк/с)")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
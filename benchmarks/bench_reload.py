@@ -0,0 +1,51 @@
+"""
+Обновление каталога после изменения 0,1% товаров: полная загрузка
+load_data_from_json против reload_catalog.
+
+Запуск: python -m benchmarks.bench_reload [N ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import best_time, write_catalog_json
+from src.logger import SilentBackend, use_backend
+from src.utils import load_data_from_json, reload_catalog
+
+
+def change_catalog(file_path, share: float = 0.001):
+    """Меняет цену и остаток share товаров первой категории"""
+    with open(file_path, encoding="utf-8") as file:
+        catalog = json.load(file)
+    products = catalog[0]["products"]
+    for record in products[: max(1, int(share * len(products) * len(catalog)))]:
+        record["price"] += 1.0
+        record["quantity"] += 1
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(catalog, file, ensure_ascii=False)
+
+
+def main(sizes):
+    print(f"{'товаров':>10}{'полная, с':>12}{'reload, с':>12}{'изменено':>10}")
+    with tempfile.TemporaryDirectory() as directory, use_backend(SilentBackend()):
+        path = os.path.join(directory, "catalog.json")
+        for size in sizes:
+            write_catalog_json(path, size, categories=100)
+            catalog = load_data_from_json(path)
+            change_catalog(path)
+
+            full = best_time(lambda: load_data_from_json(path))
+            start = time.perf_counter()
+            result = reload_catalog(catalog, path)
+            incremental = time.perf_counter() - start
+            print(
+                f"{size:>10}{full:>12.3f}{incremental:>12.3f}"
+                f"{len(result['changed']):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,49 @@
+"""
+Старт каталога: загрузка JSON через load_data_from_json против двоичного
+снимка load_snapshot и отображения снимка в память MappedCatalog
+(открытие и средние цены всех категорий).
+
+Запуск: python -m benchmarks.bench_snapshot [N ...]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.common import best_time, write_catalog_json
+from src.logger import SilentBackend, use_backend
+from src.mapped import MappedCatalog
+from src.snapshot import load_snapshot, save_snapshot
+from src.utils import iter_categories_from_json, load_data_from_json
+
+
+def open_mapped(file_path):
+    with MappedCatalog(file_path) as catalog:
+        return [category.middle_price() for category in catalog]
+
+
+def main(sizes):
+    print(
+        f"{'товаров':>10}{'JSON, с':>10}{'снимок, с':>12}{'mmap, с':>10}"
+        f"{'JSON, МБ':>10}{'снимок, МБ':>12}"
+    )
+    with tempfile.TemporaryDirectory() as directory, use_backend(SilentBackend()):
+        json_path = os.path.join(directory, "catalog.json")
+        snapshot_path = os.path.join(directory, "catalog.bin")
+        for size in sizes:
+            write_catalog_json(json_path, size)
+            save_snapshot(list(iter_categories_from_json(json_path)), snapshot_path)
+
+            from_json = best_time(lambda: load_data_from_json(json_path))
+            from_snapshot = best_time(lambda: load_snapshot(snapshot_path))
+            mapped = best_time(lambda: open_mapped(snapshot_path))
+            json_size = os.path.getsize(json_path) / 2**20
+            snapshot_size = os.path.getsize(snapshot_path) / 2**20
+            print(
+                f"{size:>10}{from_json:>10.3f}{from_snapshot:>12.3f}{mapped:>10.3f}"
+                f"{json_size:>10.1f}{snapshot_size:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,72 @@
+"""Общие помощники для бенчмарков"""
+
+import json
+import time
+
+
+def best_time(func, repeat: int = 3) -> float:
+    """Лучшее из repeat измерений времени вызова func(), в секундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def product_records(count: int, unique: int | None = None) -> list[dict]:
+    """
+    Синтетические записи товаров в формате data/products.json.
+
+    Если задано unique, названия повторяются по кругу, что даёт дубли
+    для проверки объединения в Product.new_product.
+    """
+    unique = unique or count
+    return [
+        {
+            "name": f"Товар {i % unique}",
+            "description": f"Описание товара {i % unique}",
+            "price": float(1000 + i % 9973),
+            "quantity": 1 + i % 50,
+        }
+        for i in range(count)
+    ]
+
+
+def typed_product_records(count: int) -> list[dict]:
+    """Записи товаров трёх типов вперемешку: product, smartphone, lawn_grass"""
+    records = product_records(count)
+    for i, record in enumerate(records):
+        kind = i % 3
+        if kind == 1:
+            record.update(
+                type="smartphone",
+                efficiency=float(1 + i % 10),
+                model=f"Модель {i % 100}",
+                memory=64 * (1 + i % 8),
+                color="Серый",
+            )
+        elif kind == 2:
+            record.update(
+                type="lawn_grass",
+                country="Россия",
+                germination_period=7 + i % 14,
+                color="Зелёный",
+            )
+    return records
+
+
+def write_catalog_json(file_path, count: int, categories: int = 10):
+    """Записывает синтетический каталог из count товаров в формате data/products.json"""
+    records = product_records(count)
+    per_category = -(-count // categories)
+    catalog = [
+        {
+            "name": f"Категория {i}",
+            "description": f"Описание категории {i}",
+            "products": records[i * per_category : (i + 1) * per_category],
+        }
+        for i in range(categories)
+    ]
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(catalog, file, ensure_ascii=False)
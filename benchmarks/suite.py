@@ -0,0 +1,332 @@
+"""
+Набор бенчмарков горячих путей Product, Category и Order.
+
+Каждый сценарий запускается на синтетическом каталоге в формате
+data/products.json для размеров от 10^3 до 10^6 товаров. Результаты
+можно сохранить в JSON и сравнить с сохранёнными ранее, например на
+предыдущем коммите: замедление больше порога считается регрессией, и
+запуск завершается с кодом 1.
+
+Сценарии замеряются по кругу несколько раз, время сценария - лучший из
+его замеров, вместе с ним сохраняется разброс замеров (медиана
+относительно лучшего). Порог регрессии увеличивается на двойной разброс,
+поэтому шум машины не выдаётся за замедление.
+
+Запуск:
+    python -m benchmarks.suite [--sizes 1000,10000] [--cases имя,...]
+                               [--output results.json]
+                               [--compare baseline.json] [--threshold 0.1]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from functools import lru_cache
+from pathlib import Path
+from statistics import median
+
+from benchmarks.common import product_records, write_catalog_json
+from src.category import Category, CategoryIterator, Order
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+from src.utils import load_data_from_json
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT = 5
+THRESHOLD = 0.1
+# Сценарии, меняющие состояние, вызываются в одном замере, пока сумма
+# вызовов меньше MIN_TIME секунд, но не больше MAX_CALLS раз
+MIN_TIME = 0.2
+MAX_CALLS = 200
+
+# Сценарии: имя -> (подготовка, меняет ли замер состояние).
+# Подготовка получает размер и возвращает функцию без аргументов, время
+# которой измеряется. Сценарии, меняющие состояние, готовятся заново
+# перед каждым вызовом.
+CASES = {}
+
+
+def case(name: str, mutates: bool = False):
+    """Регистрирует функцию подготовки сценария под именем name"""
+
+    def register(prepare):
+        CASES[name] = (prepare, mutates)
+        return prepare
+
+    return register
+
+
+@lru_cache(maxsize=None)
+def _records(size: int) -> tuple[dict, ...]:
+    return tuple(product_records(size))
+
+
+def _products(size: int, quantity: int | None = None) -> list[Product]:
+    records = _records(size)
+    if quantity is not None:
+        records = [{**record, "quantity": quantity} for record in records]
+    return Product.from_records(records)
+
+
+@lru_cache(maxsize=None)
+def _category(size: int) -> Category:
+    return Category("Каталог", "Синтетический каталог", _products(size))
+
+
+@lru_cache(maxsize=None)
+def _catalog_file(size: int) -> Path:
+    path = Path(_tmp_dir().name) / f"products_{size}.json"
+    write_catalog_json(path, size)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _tmp_dir() -> tempfile.TemporaryDirectory:
+    return tempfile.TemporaryDirectory(prefix="bench_suite_")
+
+
+@case("product_init")
+def product_init(size: int):
+    records = _records(size)
+    return lambda: [
+        Product(r["name"], r["description"], r["price"], r["quantity"])
+        for r in records
+    ]
+
+
+@case("new_product_merge", mutates=True)
+def new_product_merge(size: int):
+    # Половина записей - дубли уже встречавшихся товаров
+    records = product_records(size, unique=max(size // 2, 1))
+
+    def run():
+        index = {}
+        for record in records:
+            Product.new_product(record, index)
+
+    return run
+
+
+@case("category_add_product", mutates=True)
+def category_add_product(size: int):
+    products = _products(size)
+    category = Category("Каталог", "Синтетический каталог", [])
+    return lambda: [category.add_product(product) for product in products]
+
+
+@case("middle_price")
+def middle_price(size: int):
+    return _category(size).middle_price
+
+
+@case("calculate_total")
+def calculate_total(size: int):
+    return _category(size).calculate_total
+
+
+@case("category_iterator")
+def category_iterator(size: int):
+    category = _category(size)
+    return lambda: list(CategoryIterator(category))
+
+
+@case("category_iter_chunks")
+def category_iter_chunks(size: int):
+    category = _category(size)
+    return lambda: [len(chunk) for chunk in category.iter_chunks(1_000)]
+
+
+@case("category_iter_snapshot")
+def category_iter_snapshot(size: int):
+    category = _category(size)
+    return lambda: list(category.iter_snapshot())
+
+
+@case("order_add_product", mutates=True)
+def order_add_product(size: int):
+    requests = [(product, 1) for product in _products(size, quantity=10)]
+
+    def run():
+        order = Order()
+        for product, quantity in requests:
+            order.add_product(product, quantity)
+
+    return run
+
+
+@case("load_data_from_json")
+def load_json(size: int):
+    path = _catalog_file(size)
+    return lambda: load_data_from_json(path)
+
+
+def _timed_call(func) -> float:
+    """Время одного вызова func со сборщиком мусора, выключенным как в timeit"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def sample(prepare, mutates: bool, size: int) -> float:
+    """
+    Один замер времени вызова сценария, в секундах.
+
+    Быстрые вызовы повторяются, пока замер не займёт ~0,2 с. Сценарий,
+    меняющий состояние, готовится заново перед каждым вызовом и
+    вызывается, пока сумма вызовов меньше MIN_TIME, берётся лучший вызов.
+    """
+    if not mutates:
+        number, total = timeit.Timer(prepare(size)).autorange()
+        return total / number
+    calls = [_timed_call(prepare(size))]
+    while sum(calls) < MIN_TIME and len(calls) < MAX_CALLS:
+        calls.append(_timed_call(prepare(size)))
+    return min(calls)
+
+
+def run_suite(sizes=SIZES, names=None, repeat: int = REPEAT, report=None) -> dict:
+    """
+    Запускает сценарии names (по умолчанию все) для каждого размера.
+
+    Сценарии одного размера замеряются по кругу repeat раз, поэтому замеры
+    каждого сценария разнесены во времени и медленный дрейф скорости
+    машины попадает в разброс, а не в разницу между сценариями.
+
+    Возвращает {"meta": {...}, "results": {"сценарий[размер]": секунды},
+    "spread": {"сценарий[размер]": разброс}}: время - лучший из замеров,
+    разброс - (медиана - лучший) / лучший. report(key, seconds)
+    вызывается после замеров каждого сценария.
+    """
+    names = list(names or CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise KeyError(f"Неизвестные сценарии: {', '.join(unknown)}")
+    results, spread = {}, {}
+    with use_backend(SilentBackend()):
+        for size in sizes:
+            samples = {name: [] for name in names}
+            for _ in range(repeat):
+                for name in names:
+                    prepare, mutates = CASES[name]
+                    samples[name].append(sample(prepare, mutates, size))
+            for name in names:
+                key = f"{name}[{size}]"
+                best = min(samples[name])
+                results[key] = best
+                spread[key] = median(samples[name]) / best - 1
+                if report is not None:
+                    report(key, best)
+            _category.cache_clear()
+            _records.cache_clear()
+    return {"meta": _meta(sizes, repeat), "results": results, "spread": spread}
+
+
+def _meta(sizes, repeat: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": list(sizes),
+        "repeat": repeat,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """
+    Сравнивает результаты с базовыми.
+
+    Возвращает строки (ключ, было, стало, изменение, разброс) для общих
+    ключей; изменение - относительное, 0.25 означает замедление на 25%,
+    разброс - больший из разбросов двух запусков (0 для файлов без него).
+    """
+    rows = []
+    for key, seconds in results["results"].items():
+        before = baseline["results"].get(key)
+        if before:
+            noise = max(
+                results.get("spread", {}).get(key, 0.0),
+                baseline.get("spread", {}).get(key, 0.0),
+            )
+            rows.append((key, before, seconds, seconds / before - 1, noise))
+    return rows
+
+
+def regressions(rows, threshold: float = THRESHOLD) -> list:
+    """Строки сравнения, замедлившиеся больше чем на threshold + 2 * разброс"""
+    return [row for row in rows if row[3] > threshold + 2 * row[4]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--compare", help="JSON с результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.cases.split(",")
+    print(f"{'сценарий':<40}{'время, мкс':>16}")
+    data = run_suite(
+        sizes,
+        names,
+        args.repeat,
+        report=lambda key, seconds: print(
+            f"{key:<40}{seconds * 1e6:>16.3f}", flush=True
+        ),
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as file:
+        baseline = json.load(file)
+    rows = compare(data, baseline)
+    print(f"\nсравнение с {baseline['meta'].get('commit') or args.compare}:")
+    print(
+        f"{'сценарий':<40}{'было, мкс':>16}{'стало, мкс':>16}"
+        f"{'изменение':>12}{'разброс':>10}"
+    )
+    for key, before, after, change, noise in rows:
+        print(
+            f"{key:<40}{before * 1e6:>16.3f}{after * 1e6:>16.3f}"
+            f"{change:>+12.1%}{noise:>10.1%}"
+        )
+    slower = regressions(rows, args.threshold)
+    if slower:
+        print(
+            f"регрессии (порог {args.threshold:.0%} + 2 * разброс): "
+            f"{', '.join(row[0] for row in slower)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,17 @@
+import heapq
+import math
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, List
 
-from src.product import Product
+from src.logger import get_backend
+from src.metrics import get_metrics
+from src.product import (_STOCK_LOCKS, PRICE_POLICY_APPROVE, Product,
+                         _stock_lock)
 
 
 #  исключения, который отвечает за обработку событий,
@@ -36,9 +46,126 @@ class BaseEntity(ABC):
         pass
 
 
+class _SortedIndex:
+    """
+    Вторичный индекс: товары, упорядоченные по значению ключа.
+
+    Элементы лежат в отсортированных блоках ограниченного размера, поэтому
+    вставка и удаление сдвигают только один небольшой блок, а не весь
+    список. Ключ элемента - пара (значение, id(товара)): равные значения
+    не мешают найти конкретный товар бинарным поиском.
+    """
+
+    _LOAD = 1000
+
+    def __init__(self, products: Iterable[Product], key: Callable[[Product], float]):
+        products = list(products)
+        by_id = {id(p): p for p in products}
+        keys = sorted((key(p), id(p)) for p in products)
+        items = [by_id[product_id] for _, product_id in keys]
+        load = self._LOAD
+        self._keys = [keys[i : i + load] for i in range(0, len(keys), load)]
+        self._items = [items[i : i + load] for i in range(0, len(items), load)]
+        self._maxes = [bucket[-1] for bucket in self._keys]
+
+    def _bucket(self, key) -> int:
+        return min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+
+    def add(self, product: Product, value):
+        key = (value, id(product))
+        if not self._maxes:
+            self._keys.append([key])
+            self._items.append([product])
+            self._maxes.append(key)
+            return
+        bucket = self._bucket(key)
+        keys, items = self._keys[bucket], self._items[bucket]
+        position = bisect_left(keys, key)
+        keys.insert(position, key)
+        items.insert(position, product)
+        self._maxes[bucket] = keys[-1]
+        if len(keys) > 2 * self._LOAD:
+            # Слишком большой блок делится пополам
+            half = len(keys) // 2
+            self._keys[bucket : bucket + 1] = [keys[:half], keys[half:]]
+            self._items[bucket : bucket + 1] = [items[:half], items[half:]]
+            self._maxes[bucket : bucket + 1] = [keys[half - 1], keys[-1]]
+
+    def remove(self, product: Product, value):
+        key = (value, id(product))
+        bucket, keys, items = 0, [], []
+        if self._maxes:
+            bucket = self._bucket(key)
+            keys, items = self._keys[bucket], self._items[bucket]
+        position = bisect_left(keys, key)
+        if position == len(keys) or keys[position] != key:
+            # Удалить чужой элемент хуже, чем упасть: индекс рассогласован
+            raise RuntimeError(
+                f"Товар '{product.name}' со значением {value!r} не найден в индексе"
+            )
+        del keys[position]
+        del items[position]
+        if keys:
+            self._maxes[bucket] = keys[-1]
+        else:
+            del self._keys[bucket]
+            del self._items[bucket]
+            del self._maxes[bucket]
+
+    def change(self, product: Product, old_value, new_value):
+        self.remove(product, old_value)
+        self.add(product, new_value)
+
+    def range(self, low=None, high=None) -> list[Product]:
+        result = []
+        if not self._maxes:
+            return result
+        low_key = None if low is None else (low, -1)
+        high_key = None if high is None else (high, math.inf)
+        bucket = 0 if low_key is None else bisect_left(self._maxes, low_key)
+        first = True
+        for bucket in range(bucket, len(self._maxes)):
+            keys = self._keys[bucket]
+            start = bisect_left(keys, low_key) if first and low_key is not None else 0
+            first = False
+            stop = len(keys) if high_key is None else bisect_right(keys, high_key)
+            result.extend(self._items[bucket][start:stop])
+            if stop < len(keys):
+                break
+        return result
+
+    def smallest(self, count: int) -> list[Product]:
+        result = []
+        for items in self._items:
+            if len(result) >= count:
+                break
+            result.extend(items[: count - len(result)])
+        return result
+
+    def largest(self, count: int) -> list[Product]:
+        result = []
+        for items in reversed(self._items):
+            if len(result) >= count:
+                break
+            result.extend(reversed(items[-(count - len(result)) :]))
+        return result
+
+
+def _price_of(product: Product) -> float:
+    return product.price
+
+
+def _quantity_of(product: Product) -> int:
+    return product.quantity
+
+
 class Category(BaseEntity):
     total_categories = 0
     total_products = 0
+    # Защищает счётчики total_categories и total_products
+    _counters_lock = threading.Lock()
+    # Проверять накопленные суммы полным пересчётом (для тестов)
+    check_aggregates = False
     __products: List[Product] = []
 
     def __init__(self, name: str, description: str, products: Product | List[Product]):
@@ -51,6 +178,15 @@ class Category(BaseEntity):
             raise ValueError("Некорректное описание категории")
         self.description = description
 
+        # Защищает список товаров, суммы и индексы категории
+        self.__lock = threading.Lock()
+        # Суммы количества и цен товаров, обновляются при каждом изменении
+        self.__quantity_total = 0
+        self.__price_total = 0.0
+        # Индексы по цене и количеству, включаются через enable_indexes()
+        self.__price_index = None
+        self.__quantity_index = None
+
         self.__products = []
         if isinstance(products, list):
             # self.validate_product(p for p in products)
@@ -66,7 +202,8 @@ class Category(BaseEntity):
         else:
             raise ValueError("Некорректный список продуктов")
 
-        Category.total_categories += 1
+        with Category._counters_lock:
+            Category.total_categories += 1
 
     def validate_product(self, product: Product):
         if not isinstance(product, Product):
@@ -74,20 +211,123 @@ class Category(BaseEntity):
         if product.quantity == 0:
             raise ZeroQuantity
 
+    def __getstate__(self):
+        """
+        Состояние для copy и pickle без блокировки категории. Индексы
+        не сохраняются: их ключи содержат id товаров, которые у копий
+        другие, поэтому индексы строятся заново в __setstate__.
+        """
+        state = self.__dict__.copy()
+        del state["_Category__lock"]
+        # У копии свои суммы, поэтому и свой список товаров
+        if self.__products is not None:
+            with self.__lock:
+                state["_Category__products"] = list(self.__products)
+        state["_Category__price_index"] = state["_Category__quantity_index"] = None
+        return state, self.has_indexes
+
+    def __setstate__(self, state):
+        state, indexed = state
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+        # Подписки товаров на категории не сохраняются (Product.__getstate__)
+        for product in self.__products or ():
+            product._attach_category(self)
+        if indexed:
+            self.enable_indexes()
+
     def __str__(self):
-        sum_products = 0
-        # Суммирую общее кол-во продуктов
-        for product in self.__products:
-            sum_products += product.quantity
         # Название категории, количество продуктов: 200 шт.
-        return f"{self.name}, количество продуктов: {sum_products}"
+        return f"{self.name}, количество продуктов: {self.calculate_total()}"
 
     @property
     def products(self):
-        result = ""
-        for product in self.__products:
-            result += product.__str__() + "\n"
-        return result
+        return "".join(self.iter_products())
+
+    def __len__(self) -> int:
+        return len(self.__products) if self.__products is not None else 0
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Обход товаров встроенным итератором списка, без копирования.
+
+        Товары, добавленные во время обхода, тоже попадут в него; обход
+        по состоянию на начало - iter_snapshot().
+        """
+        return iter(self.__products or ())
+
+    def __getitem__(self, index: int | slice) -> Product | List[Product]:
+        """Товар по индексу или список товаров по срезу"""
+        return (self.__products or [])[index]
+
+    def iter_snapshot(self) -> Iterator[Product]:
+        """
+        Обход копии списка товаров, снятой под блокировкой категории.
+
+        Добавление и удаление товаров во время обхода на него не влияют.
+        """
+        return iter(self._snapshot())
+
+    def iter_chunks(self, size: int, snapshot: bool = False) -> Iterator[List[Product]]:
+        """
+        Товары списками по size штук, последний список может быть короче.
+
+        Каждая порция - срез списка товаров: копируются только size ссылок.
+        snapshot=True - порции режутся из копии списка на начало обхода.
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("Размер порции должен быть положительным целым числом")
+        products = self._snapshot() if snapshot else self.__products or []
+        start = 0
+        while start < len(products):
+            yield products[start : start + size]
+            start += size
+
+    def _page(self, offset: int, limit: int | None) -> Iterator[Product]:
+        """
+        Товары с offset по offset + limit. Срез копирует только страницу,
+        а не пропускает offset товаров по одному, как islice.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset и limit не могут быть отрицательными")
+        products = self.__products or []
+        stop = len(products) if limit is None else offset + limit
+        return iter(products[offset:stop])
+
+    def iter_products(self, offset: int = 0, limit: int | None = None) -> Iterator[str]:
+        """Строки свойства products по одной, с постраничной выборкой"""
+        for product in self._page(offset, limit):
+            yield f"{product}\n"
+
+    def iter_product_info(
+        self, offset: int = 0, limit: int | None = None
+    ) -> Iterator[str]:
+        """Строки свойства get_product_info по одной, с постраничной выборкой"""
+        for product in self._page(offset, limit):
+            yield (
+                f"{product.name}, {product.price} руб. "
+                f"Остаток: {product.quantity} шт.\n"
+            )
+
+    def write_products(self, stream, offset: int = 0, limit: int | None = None):
+        """Записывает строки products в текстовый поток (файл, socket.makefile("w"))"""
+        stream.writelines(self.iter_products(offset, limit))
+
+    def write_product_info(self, stream, offset: int = 0, limit: int | None = None):
+        """Записывает строки get_product_info в текстовый поток"""
+        stream.writelines(self.iter_product_info(offset, limit))
+
+    def _snapshot(self) -> List[Product]:
+        """Копия списка товаров, снятая под блокировкой категории"""
+        with self.__lock:
+            return list(self.__products or [])
+
+    def to_dataframe(self):
+        """Товары категории в виде pandas.DataFrame, см. src.dataframe"""
+        # pandas нужен только здесь, поэтому импорт при вызове
+        from src.dataframe import category_to_dataframe
+
+        return category_to_dataframe(self)
 
     @property
     def category_count(self):
@@ -107,10 +347,7 @@ class Category(BaseEntity):
 
     @property
     def get_product_info(self):
-        result = ""
-        for product in self.__products:
-            result += f"{product.name}, {product.price} руб. Остаток: {product.quantity} шт.\n"
-        return result
+        return "".join(self.iter_product_info())
 
     def add_product(self, product: Product):
         #
@@ -120,21 +357,212 @@ class Category(BaseEntity):
             raise ValueError(
                 "Продукт должен быть объектом или подклассом класса Product"
             )
+        backend = get_backend()
+        metrics = get_metrics()
+        measured = metrics.enabled
+        if measured:
+            start = perf_counter()
         try:
             self.validate_product(product)
         except ZeroQuantity:
+            if measured:
+                metrics.inc("category_add_rejected_total")
             raise ZeroQuantity
         else:
-            print(f"Товар добавлен: {product.name}")
+            if backend.enabled:
+                backend.emit("product_added", name=product.name)
 
         finally:
-            Category.total_products += 1
-            print(f"Обработка добавления товара завершена")
+            with Category._counters_lock:
+                Category.total_products += 1
+            if backend.enabled:
+                backend.emit("product_add_finished")
+            self._append(product)
+        if measured:
+            metrics.inc("category_products_added_total")
+            metrics.observe("category_add_product_seconds", perf_counter() - start)
+
+    def _append(self, product: Product):
+        """Добавление товара в список, суммы и индексы без проверок"""
+        # Блокировка остатка не даёт товару измениться между чтением
+        # его количества и подпиской категории на изменения
+        with _stock_lock(product), self.__lock:
             # self.__products = products.copy()
             self.__products.append(product)
+            self.__quantity_total += product.quantity
+            self.__price_total += product.price
+            if self.__price_index is not None:
+                self.__price_index.add(product, product.price)
+                self.__quantity_index.add(product, product.quantity)
+            product._attach_category(self)
+
+    @classmethod
+    def restore(
+        cls, name: str, description: str, products: Iterable[Product]
+    ) -> "Category":
+        """
+        Категория из сохранённого состояния (снимок, таблица, DataFrame).
+
+        Это восстановление, а не добавление товаров: validate_product не
+        вызывается, поэтому распроданные товары с нулевым остатком
+        остаются в категории. Суммы, индексы и Category.total_products
+        обновляются как при add_product.
+        """
+        products = list(products)
+        if any(not isinstance(p, Product) for p in products):
+            raise ValueError("Некорректный список продуктов")
+        category = cls(name, description, [])
+        for product in products:
+            category._append(product)
+        with Category._counters_lock:
+            Category.total_products += len(products)
+        return category
+
+    def remove_products(self, products: Iterable[Product]) -> int:
+        """
+        Удаляет товары из категории за один проход по списку.
+
+        Суммы, индексы и счётчик Category.total_products уменьшаются,
+        категория отписывается от изменений удалённых товаров.
+        Товары, которых нет в категории, пропускаются. Возвращает число
+        удалённых товаров.
+        """
+        targets = {id(product): product for product in products}
+        if not targets or not self.__products:
+            return 0
+        # Блокировки берутся в одном порядке, как в OrderBatch
+        locks = {}
+        for product in targets.values():
+            lock = _stock_lock(product)
+            locks[id(lock)] = lock
+        with ExitStack() as stack:
+            for lock_id in sorted(locks):
+                stack.enter_context(locks[lock_id])
+            stack.enter_context(self.__lock)
+
+            kept = []
+            removed = 0
+            for product in self.__products:
+                if targets.pop(id(product), None) is None:
+                    kept.append(product)
+                    continue
+                removed += 1
+                self.__quantity_total -= product.quantity
+                self.__price_total -= product.price
+                if self.__price_index is not None:
+                    self.__price_index.remove(product, product.price)
+                    self.__quantity_index.remove(product, product.quantity)
+                product._detach_category(self)
+            self.__products = kept
+
+        with Category._counters_lock:
+            Category.total_products -= removed
+        return removed
+
+    def remove_product(self, product: Product) -> bool:
+        """Удаляет товар из категории, False - если его там не было"""
+        return self.remove_products([product]) == 1
+
+    def discard(self):
+        """Удаляет все товары категории и исключает её из total_categories"""
+        if self.__products:
+            self.remove_products(list(self.__products))
+        with Category._counters_lock:
+            Category.total_categories -= 1
+
+    def _product_price_changed(self, product: Product, old_price, new_price):
+        with self.__lock:
+            self.__price_total += new_price - old_price
+            if self.__price_index is not None:
+                self.__price_index.change(product, old_price, new_price)
+
+    def _product_quantity_changed(self, product: Product, old_quantity, new_quantity):
+        with self.__lock:
+            self.__quantity_total += new_quantity - old_quantity
+            if self.__quantity_index is not None:
+                self.__quantity_index.change(product, old_quantity, new_quantity)
+
+    def enable_indexes(self):
+        """
+        Включает отсортированные индексы по цене и количеству.
+
+        Индексы строятся за O(n log n) и дальше поддерживаются при добавлении
+        товаров и изменении их цены или количества. Для больших категорий
+        индексы выгоднее включать после загрузки товаров.
+
+        Индексы строятся под всеми блокировками остатков: изменение цены
+        или количества, уже записавшее новое значение, но ещё не
+        обновившее категорию, завершится до построения, а не после него.
+        """
+        with ExitStack() as stack:
+            # Порядок блокировок тот же, что в remove_products и OrderBatch
+            for lock in sorted(_STOCK_LOCKS, key=id):
+                stack.enter_context(lock)
+            stack.enter_context(self.__lock)
+            products = self.__products or []
+            self.__price_index = _SortedIndex(products, _price_of)
+            self.__quantity_index = _SortedIndex(products, _quantity_of)
+
+    def disable_indexes(self):
+        with self.__lock:
+            self.__price_index = None
+            self.__quantity_index = None
+
+    @property
+    def has_indexes(self) -> bool:
+        return self.__price_index is not None
+
+    def _range(self, index, key, low, high) -> list[Product]:
+        if index is not None:
+            return index.range(low, high)
+        # Без индекса - линейный проход
+        selected = [
+            p
+            for p in self.__products or []
+            if (low is None or key(p) >= low) and (high is None or key(p) <= high)
+        ]
+        return sorted(selected, key=key)
+
+    def _top(self, index, key, count: int, highest: bool) -> list[Product]:
+        if index is not None:
+            return index.largest(count) if highest else index.smallest(count)
+        select = heapq.nlargest if highest else heapq.nsmallest
+        return select(count, self.__products or [], key=key)
+
+    def products_in_price_range(self, low=None, high=None) -> list[Product]:
+        """Товары с ценой от low до high включительно, по возрастанию цены"""
+        return self._range(self.__price_index, _price_of, low, high)
+
+    def products_in_quantity_range(self, low=None, high=None) -> list[Product]:
+        """Товары с остатком от low до high включительно, по возрастанию остатка"""
+        return self._range(self.__quantity_index, _quantity_of, low, high)
+
+    def top_by_price(self, count: int, highest: bool = True) -> list[Product]:
+        """count самых дорогих (или самых дешёвых при highest=False) товаров"""
+        return self._top(self.__price_index, _price_of, count, highest)
+
+    def top_by_quantity(self, count: int, highest: bool = True) -> list[Product]:
+        """count товаров с наибольшим (или наименьшим) остатком"""
+        return self._top(self.__quantity_index, _quantity_of, count, highest)
+
+    def verify_aggregates(self):
+        """Сверяет накопленные суммы с полным пересчётом по списку товаров"""
+        with self.__lock:
+            products = self.__products or []
+            quantity_total = sum(p.quantity for p in products)
+            price_total = math.fsum(p.price for p in products)
+            consistent = quantity_total == self.__quantity_total and math.isclose(
+                price_total, self.__price_total, rel_tol=1e-9, abs_tol=1e-6
+            )
+        if not consistent:
+            raise RuntimeError(
+                f"Накопленные суммы категории '{self.name}' не совпадают с пересчётом"
+            )
 
     def calculate_total(self) -> float:
-        return sum(p.quantity for p in self.__products)
+        if Category.check_aggregates:
+            self.verify_aggregates()
+        return self.__quantity_total
 
     @property
     def display_info(self) -> str:
@@ -148,36 +576,92 @@ class Category(BaseEntity):
             or len(self.__products) == 0
         ):
             return 0
+        if Category.check_aggregates:
+            self.verify_aggregates()
         # подсчета среднего ценника всех товаров в классе Category
         # суммарная стоимость всех категорий товаров, делим на кол-во категорий товаров
-        return sum(p.price for p in self.__products) / len(self.__products)
+        return self.__price_total / len(self.__products)
 
 
 class CategoryIterator:
+    """
+    Итератор по товарам категории.
+
+    Обход идёт встроенным итератором списка: for и list() получают его
+    прямо из __iter__, без вызова __next__ на каждый товар.
+    """
+
     def __init__(self, category):
         self.category = category
-        self.index = 0
+        self._products = iter(category)
 
     def __iter__(self):
-        return self
+        return self._products
 
     def __next__(self):
-        if self.index < len(self.category._Category__products):
-            product = self.category._Category__products[self.index]
-            self.index += 1
-            return product
+        return next(self._products)
+
+
+def reprice(
+    category_or_products: "Category | Iterable[Product]",
+    mapping_or_function: dict[str, float] | Callable[[Product], float | None],
+    policy=PRICE_POLICY_APPROVE,
+) -> dict[str, list]:
+    """
+    Массовое изменение цен за один проход без обращения к input().
+
+    Параметры:
+    category_or_products: категория или набор товаров.
+    mapping_or_function: словарь {название товара: новая цена} или функция,
+        возвращающая новую цену товара (None - цену не менять).
+    policy: политика понижения цены (см. PRICE_POLICY_* в src.product),
+        по умолчанию понижения применяются без подтверждения.
+
+    Возвращает:
+    dict: {"applied": [...], "rejected": [...], "invalid": [...]}, где элементы -
+    кортежи (название, старая цена, новая цена).
+    """
+    summary = {"applied": [], "rejected": [], "invalid": []}
+    for product in category_or_products:
+        if callable(mapping_or_function):
+            new_price = mapping_or_function(product)
         else:
-            raise StopIteration
+            new_price = mapping_or_function.get(product.name)
+        if new_price is None:
+            continue
+        change = (product.name, product.price, new_price)
+        if not isinstance(new_price, (int, float)) or new_price <= 0:
+            summary["invalid"].append(change)
+        elif product.set_price(new_price, policy):
+            summary["applied"].append(change)
+        else:
+            summary["rejected"].append(change)
+    return summary
 
 
 class Order(BaseEntity):
-    def __init__(self, product: Product, quantity: int):
-        self.validate_product(product)
-        self._validate_quantity(product, quantity)
-
-        self.__products = product
-        self.quantity = quantity
-        self.__products.quantity -= quantity
+    """
+    Заказ из нескольких строк (товар, количество).
+
+    Строки хранятся компактно: список товаров и параллельные массивы
+    количеств и цен, по которым товар был заказан. Общая сумма и число
+    единиц поддерживаются при каждом изменении строки, поэтому
+    calculate_total() не проходит по строкам. Повторное добавление товара
+    увеличивает его строку, а не создаёт новую.
+
+    Order(product, quantity) - заказ из одной строки, Order() - пустой заказ.
+    """
+
+    def __init__(self, product: Product | None = None, quantity: int = 1):
+        self.__products: list[Product] = []
+        self.__quantities = array("q")
+        self.__prices = array("d")
+        # Позиция строки по товару
+        self.__positions: dict[Product, int] = {}
+        self.__total = 0.0
+        self.__quantity = 0
+        if product is not None:
+            self.add_product(product, quantity)
 
     def validate_product(self, product: Product):
         if not hasattr(product, "price"):
@@ -187,40 +671,273 @@ class Order(BaseEntity):
         if quantity <= 0 or product.quantity < quantity:
             raise ValueError("Некорректное количество товара")
 
-    def add_product(self, product: Product):
-        #
-        if not isinstance(product, Product) and not issubclass(
-            product.__class__, Product
-        ):
-            raise ValueError(
-                "Продукт должен быть объектом или подклассом класса Product"
-            )
+    def _add_line(self, product: Product, quantity: int):
+        """Добавляет уже списанное со склада количество в строку товара"""
+        position = self.__positions.get(product)
+        if position is None:
+            self.__positions[product] = len(self.__products)
+            self.__products.append(product)
+            self.__quantities.append(quantity)
+            self.__prices.append(product.price)
+            price = product.price
+        else:
+            self.__quantities[position] += quantity
+            price = self.__prices[position]
+        self.__total += price * quantity
+        self.__quantity += quantity
+
+    def add_product(self, product: Product, quantity: int = 1):
+        """Добавляет quantity единиц товара, остаток списывается сразу"""
+        metrics = get_metrics()
+        start = perf_counter() if metrics.enabled else 0.0
+        self.validate_product(product)
         try:
-            self.validate_product(product)
-        except ZeroQuantity:
-            pass
+            self._validate_quantity(product, quantity)
+            # Проверка остатка и списание выполняются атомарно
+            product.reserve(quantity)
+        except ValueError:
+            if metrics.enabled:
+                _record_order(metrics, "add_product", start, 0, 1)
+            raise
+        self._add_line(product, quantity)
+        backend = get_backend()
+        if backend.enabled:
+            backend.emit("product_added", name=product.name)
+        if metrics.enabled:
+            _record_order(metrics, "add_product", start, 1, 0)
+
+    def add_products(self, requests: Iterable[tuple[Product, int]]):
+        """
+        Добавляет много строк за один вызов.
+
+        Остатки списываются как в OrderBatch: под блокировками всех товаров
+        и одним изменением на товар. Если на какую-либо строку не хватает
+        остатка, ValueError и заказ не меняется.
+        """
+        metrics = get_metrics()
+        start = perf_counter() if metrics.enabled else 0.0
+        accepted = []
+        try:
+            for product, quantity in requests:
+                self.validate_product(product)
+                if not isinstance(quantity, int) or quantity <= 0:
+                    raise ValueError("Некорректное количество товара")
+                accepted.append((product, quantity))
+            lines = _reserve_lines(accepted, True, None)
+        except ValueError:
+            if metrics.enabled:
+                _record_order(metrics, "add_products", start, 0, 1)
+            raise
+        for product, quantity in lines:
+            self._add_line(product, quantity)
+        if metrics.enabled:
+            _record_order(metrics, "add_products", start, len(lines), 0)
+
+    def remove_product(self, product: Product) -> bool:
+        """
+        Удаляет строку товара и возвращает количество на склад.
+
+        На место удалённой встаёт последняя строка, поэтому удаление не
+        зависит от размера заказа. False - если товара в заказе нет.
+        """
+        position = self.__positions.pop(product, None)
+        if position is None:
+            return False
+        quantity = self.__quantities[position]
+        self.__total -= self.__prices[position] * quantity
+        self.__quantity -= quantity
+        last = len(self.__products) - 1
+        if position != last:
+            moved = self.__products[last]
+            self.__products[position] = moved
+            self.__quantities[position] = self.__quantities[last]
+            self.__prices[position] = self.__prices[last]
+            self.__positions[moved] = position
+        self.__products.pop()
+        self.__quantities.pop()
+        self.__prices.pop()
+        product.restock(quantity)
+        return True
+
+    def update_quantity(self, new_quantity: int, product: Product | None = None):
+        """
+        Обновление количества строки с пересчетом суммы.
+
+        Без product меняется единственная строка заказа.
+        """
+        if new_quantity <= 0:
+            raise ValueError("Количество должно быть положительным числом")
+        if product is None:
+            if len(self.__products) != 1:
+                raise ValueError("Укажите товар: в заказе не одна строка")
+            product = self.__products[0]
+        position = self.__positions.get(product)
+        if position is None:
+            raise KeyError(product.name)
+        quantity = self.__quantities[position]
+        if new_quantity > quantity:
+            product.reserve(new_quantity - quantity)
         else:
-            print(f"Товар добавлен: {product.name}")
+            product.restock(quantity - new_quantity)
+        self.__quantities[position] = new_quantity
+        self.__total += self.__prices[position] * (new_quantity - quantity)
+        self.__quantity += new_quantity - quantity
 
-        finally:
-            Category.total_products += 1
-            print(f"Обработка добавления товара завершена")
-        self.__products.append(product)
+    @property
+    def quantity(self) -> int:
+        """Общее количество единиц товара в заказе"""
+        return self.__quantity
+
+    @property
+    def lines(self) -> list[tuple[Product, int, float]]:
+        """Строки заказа: (товар, количество, стоимость строки)"""
+        return [
+            (product, quantity, price * quantity)
+            for product, quantity, price in zip(
+                self.__products, self.__quantities, self.__prices
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.__products)
+
+    def __contains__(self, product) -> bool:
+        return product in self.__positions
 
     def calculate_total(self) -> float:
-        return self.__products.price * self.quantity
+        return self.__total
 
     @property
     def display_info(self) -> str:
-        return f"Заказ: {self.__products.name} × {self.quantity} = {self.calculate_total():.2f} ₽"
-
-    def update_quantity(self, new_quantity: int):
-        """Обновление количества с пересчетом суммы"""
-        if new_quantity <= 0:
-            raise ValueError("Количество должно быть положительным числом")
-        self.__products.quantity -= new_quantity - self.quantity
-        self.quantity = new_quantity
-        self.total = self.calculate_total()
+        if len(self.__products) == 1:
+            name = self.__products[0].name
+            return f"Заказ: {name} × {self.__quantity} = {self.__total:.2f} ₽"
+        return (
+            f"Заказ: строк {len(self.__products)}, единиц {self.__quantity}, "
+            f"итого {self.__total:.2f} ₽"
+        )
 
     def __repr__(self):
-        return f"Заказ: {self.product} × {self.quantity} = {self.total:.2f} ₽"
+        return self.display_info
+
+
+def _record_order(metrics, operation: str, start: float, lines: int, rejected: int):
+    """Записывает метрики оформления заказа операцией operation"""
+    if lines:
+        metrics.inc("order_lines_total", lines, operation=operation)
+    if rejected:
+        metrics.inc("order_rejected_total", rejected, operation=operation)
+    metrics.observe("order_place_seconds", perf_counter() - start, operation=operation)
+
+
+def _reserve_lines(
+    accepted: list[tuple[Product, int]],
+    all_or_nothing: bool,
+    rejected: list[tuple[Product, int, str]] | None,
+) -> list[tuple[Product, int]]:
+    """
+    Списывает остатки для строк (товар, количество) за один проход.
+
+    Возвращает прошедшие строки, не прошедшие при all_or_nothing=False
+    попадают в rejected.
+    """
+    # Блокировки берутся в одном порядке, чтобы пакеты не ждали друг друга
+    locks = {}
+    for product, _ in accepted:
+        lock = _stock_lock(product)
+        locks[id(lock)] = lock
+    with ExitStack() as stack:
+        for lock_id in sorted(locks):
+            stack.enter_context(locks[lock_id])
+
+        remaining = {}
+        lines = []
+        for product, quantity in accepted:
+            left = remaining.get(product, product.quantity)
+            if left >= quantity:
+                remaining[product] = left - quantity
+                lines.append((product, quantity))
+            elif all_or_nothing:
+                raise ValueError(f"Недостаточно товара '{product.name}'")
+            else:
+                remaining[product] = left
+                rejected.append((product, quantity, "Недостаточно товара"))
+        # Одно изменение остатка на товар, а не на каждую строку
+        for product, left in remaining.items():
+            if left != product.quantity:
+                product._set_quantity(left)
+    return lines
+
+
+class OrderBatch(BaseEntity):
+    """
+    Пакет заказов: множество строк (товар, количество) за один вызов.
+
+    Остатки всех товаров пакета проверяются и списываются под их
+    блокировками за один проход, каждый товар списывается один раз на
+    суммарное количество по всем его строкам.
+
+    all_or_nothing=True - либо проходят все строки, либо ни одна (ValueError);
+    all_or_nothing=False - проходят строки, на которые хватает остатка,
+    остальные попадают в rejected.
+    """
+
+    def __init__(self, requests: Iterable[tuple[Product, int]], all_or_nothing=True):
+        # Строки: (товар, количество, стоимость строки)
+        self.lines: list[tuple[Product, int, float]] = []
+        # Отклонённые строки: (товар, количество, причина)
+        self.rejected: list[tuple[Product, int, str]] = []
+        self.__total = 0.0
+        metrics = get_metrics()
+        start = perf_counter() if metrics.enabled else 0.0
+        try:
+            self._place(requests, all_or_nothing)
+        except ValueError:
+            if metrics.enabled:
+                _record_order(metrics, "place_orders", start, 0, 1)
+            raise
+        if metrics.enabled:
+            _record_order(
+                metrics, "place_orders", start, len(self.lines), len(self.rejected)
+            )
+
+    def validate_product(self, product: Product):
+        if not isinstance(product, Product):
+            raise ValueError("Объект должен быть экземпляром Product")
+
+    def _place(self, requests, all_or_nothing: bool):
+        accepted = []
+        for product, quantity in requests:
+            try:
+                self.validate_product(product)
+                if not isinstance(quantity, int) or quantity <= 0:
+                    raise ValueError("Некорректное количество товара")
+            except ValueError as e:
+                if all_or_nothing:
+                    raise
+                self.rejected.append((product, quantity, str(e)))
+            else:
+                accepted.append((product, quantity))
+
+        lines = _reserve_lines(accepted, all_or_nothing, self.rejected)
+        for product, quantity in lines:
+            line_total = product.price * quantity
+            self.lines.append((product, quantity, line_total))
+            self.__total += line_total
+
+    def calculate_total(self) -> float:
+        return self.__total
+
+    @property
+    def display_info(self) -> str:
+        return (
+            f"Пакет заказов: строк {len(self.lines)}, отклонено {len(self.rejected)}, "
+            f"итого {self.__total:.2f} ₽"
+        )
+
+
+def place_orders(
+    requests: Iterable[tuple[Product, int]], all_or_nothing: bool = True
+) -> OrderBatch:
+    """Оформляет пакет заказов, см. OrderBatch"""
+    return OrderBatch(requests, all_or_nothing)
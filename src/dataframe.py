@@ -0,0 +1,183 @@
+"""
+Обмен данными каталога с pandas.DataFrame.
+
+Одна строка таблицы - один товар: категория, тип товара (поле "type"),
+основные поля и дополнительные поля наследников (для остальных товаров в
+них пропуски). Отчёты по категориям считаются векторно через groupby
+вместо циклов по объектам Product.
+"""
+
+from operator import attrgetter
+from typing import Iterable
+
+import pandas as pd
+
+from src.category import Category
+from src.product import Product, product_class, product_type_name
+
+# Основные столбцы в порядке следования
+COLUMNS = (
+    "category",
+    "category_description",
+    "type",
+    "name",
+    "description",
+    "price",
+    "quantity",
+)
+
+
+def catalog_to_dataframe(categories: Iterable[Category]) -> pd.DataFrame:
+    """
+    Таблица товаров всех категорий.
+
+    Столбец category - категориальный, поэтому группировка по нему быстрая.
+    Категории без товаров в таблицу не попадают.
+    """
+    columns = {name: [] for name in COLUMNS if name != "category"}
+    category_names: list[str] = []
+    category_codes: list[int] = []
+    codes: dict[str, int] = {}
+    extra: dict[str, list] = {}
+    type_names: dict[type, str] = {}
+    size = 0
+    for category in categories:
+        products = category._snapshot()
+        if not products:
+            continue
+        count = len(products)
+        code = codes.get(category.name)
+        if code is None:
+            code = codes[category.name] = len(category_names)
+            category_names.append(category.name)
+        category_codes += [code] * count
+        columns["category_description"] += [category.description] * count
+        columns["name"] += map(attrgetter("name"), products)
+        columns["description"] += map(attrgetter("description"), products)
+        columns["price"] += map(attrgetter("price"), products)
+        columns["quantity"] += map(attrgetter("quantity"), products)
+
+        # Тип и дополнительные поля заполняются по классам товаров
+        classes = list(map(type, products))
+        present = set(classes)
+        for cls in present:
+            if cls not in type_names:
+                type_names[cls] = product_type_name(cls)
+            for spec in cls.field_checks:
+                if spec[0] not in extra:
+                    extra[spec[0]] = [None] * size
+        if len(present) == 1:
+            columns["type"] += [type_names[classes[0]]] * count
+        else:
+            columns["type"] += map(type_names.__getitem__, classes)
+        for field, values in extra.items():
+            if any(field in {spec[0] for spec in cls.field_checks} for cls in present):
+                values += [getattr(p, field, None) for p in products]
+            else:
+                values += [None] * count
+        size += count
+
+    frame = pd.DataFrame(
+        {
+            "category": pd.Categorical.from_codes(category_codes, category_names),
+            **columns,
+        },
+        columns=list(COLUMNS),
+    )
+    for field, values in extra.items():
+        # object - чтобы целые значения не превращались в float из-за пропусков
+        frame[field] = pd.Series(values, dtype=object)
+    frame["price"] = frame["price"].astype("float64")
+    frame["quantity"] = frame["quantity"].astype("int64")
+    return frame
+
+
+def category_to_dataframe(category: Category) -> pd.DataFrame:
+    """Таблица товаров одной категории, см. catalog_to_dataframe"""
+    return catalog_to_dataframe([category])
+
+
+def _python_values(series: pd.Series, types) -> list:
+    """
+    Значения столбца в виде объектов Python.
+
+    Целочисленные поля после пропусков хранятся как float (256.0),
+    такие значения возвращаются к int, остальные проверит Product.
+    """
+    values = series.tolist()
+    if types is int:
+        values = [
+            int(value) if isinstance(value, float) and value.is_integer() else value
+            for value in values
+        ]
+    return values
+
+
+def from_dataframe(frame: pd.DataFrame) -> list[Product]:
+    """
+    Пакетное создание товаров из таблицы.
+
+    Класс товара определяется столбцом type (нет столбца или пропуск -
+    Product), товары каждого типа создаются одним вызовом from_columns.
+    Порядок товаров совпадает с порядком строк.
+    """
+    if "type" in frame.columns:
+        types = frame["type"].where(frame["type"].notna(), "product")
+    else:
+        types = pd.Series("product", index=frame.index)
+    products: list = [None] * len(frame)
+    # indices - позиции строк каждого типа, не зависят от индекса таблицы
+    for type_name, rows in frame.groupby(types.to_numpy(), sort=False).indices.items():
+        cls = product_class(type_name)
+        group = frame.iloc[rows]
+        extra_columns = {
+            spec[0]: _python_values(group[spec[0]], spec[1])
+            for spec in cls.field_checks
+        }
+        created = cls.from_columns(
+            group["name"].tolist(),
+            group["description"].tolist(),
+            group["price"].tolist(),
+            _python_values(group["quantity"], int),
+            **extra_columns,
+        )
+        for position, product in zip(rows.tolist(), created):
+            products[position] = product
+    return products
+
+
+def categories_from_dataframe(frame: pd.DataFrame) -> list[Category]:
+    """
+    Категории с товарами из таблицы catalog_to_dataframe.
+
+    Категории следуют в порядке первого появления в таблице.
+    """
+    products = from_dataframe(frame)
+    grouped: dict[tuple[str, str], list[Product]] = {}
+    for key, product in zip(
+        zip(frame["category"].tolist(), frame["category_description"].tolist()),
+        products,
+    ):
+        grouped.setdefault(key, []).append(product)
+    return [
+        Category.restore(name, description, items)
+        for (name, description), items in grouped.items()
+    ]
+
+
+def category_report(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Отчёт по категориям одной группировкой.
+
+    Столбцы: middle_price (как Category.middle_price), quantity (как
+    Category.calculate_total) и stock_value - стоимость остатков.
+    """
+    stock = frame["price"] * frame["quantity"]
+    grouped = frame.assign(stock_value=stock).groupby(
+        "category", sort=False, observed=True
+    )
+    return grouped.agg(
+        middle_price=("price", "mean"),
+        quantity=("quantity", "sum"),
+        stock_value=("stock_value", "sum"),
+    )
@@ -0,0 +1,231 @@
+"""
+Генератор синтетических каталогов для нагрузочного тестирования.
+
+Каталог любого размера детерминирован зерном seed и пишется потоково,
+поэтому расход памяти не зависит от размера файла. Форматы:
+    json  - схема data/products.json: массив категорий со списками товаров;
+    jsonl - по товару на строку, с полями category и category_description
+            (см. src.utils.iter_categories_from_jsonl).
+
+Товары зарегистрированных типов (поле "type") получают дополнительные
+поля по их field_checks. Доля duplicates товаров повторяет название
+одного из предыдущих товаров категории (объединение в Product.new_product),
+доля zero_quantity получает нулевой остаток (ZeroQuantity при загрузке).
+
+Запуск: python -m src.generator файл --count N [--format jsonl] [--seed 0]
+"""
+
+import argparse
+import json
+import random
+from typing import Iterator
+
+from src.product import product_class
+
+DEFAULT_TYPES = ("product", "smartphone", "lawn_grass")
+
+# Названия товаров по типу, для остальных типов - сам тип
+NAME_PREFIXES = {
+    "product": "Товар",
+    "smartphone": "Смартфон",
+    "lawn_grass": "Газонная трава",
+}
+
+# Значения строковых полей по названию поля, для остальных - "поле N"
+FIELD_VALUES = {
+    "color": ("Серый", "Чёрный", "Белый", "Синий", "Зелёный"),
+    "country": ("Россия", "Китай", "США", "Германия", "Нидерланды"),
+}
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(value: int) -> int:
+    """Перемешивание splitmix64: быстрое детерминированное число по индексу"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def _field_generator(field: str, types):
+    """Функция salt -> значение поля field допустимого типа types"""
+    if not isinstance(types, tuple):
+        types = (types,)
+    if str in types:
+        values = FIELD_VALUES.get(field)
+        if values:
+            return lambda salt: values[salt % len(values)]
+        return lambda salt: f"{field} {salt % 100}"
+    if float in types:
+        return lambda salt: float(1 + salt % 1000) / 10
+    if int in types:
+        return lambda salt: 1 + salt % 1024
+    raise ValueError(f"Не удаётся сгенерировать значение поля {field}")
+
+
+class _Identity:
+    """
+    Неизменные поля товара с номером index: тип, название, описание и
+    дополнительные поля типа. Вычисляются по номеру, а не запоминаются,
+    поэтому дубль воспроизводит исходный товар без хранения каталога.
+    """
+
+    def __init__(self, seed: int, types: tuple[str, ...]):
+        self._seed = _mix(seed)
+        # (префикс названия, значение поля "type", генераторы полей) по типам
+        self._layouts = []
+        for type_name in types:
+            fields = tuple(
+                (field, _field_generator(field, field_types))
+                for field, field_types, *_ in product_class(type_name).field_checks
+            )
+            self._layouts.append(
+                (
+                    NAME_PREFIXES.get(type_name, type_name),
+                    None if type_name == "product" else type_name,
+                    fields,
+                )
+            )
+
+    def record(self, index: int) -> dict:
+        salt = _mix(self._seed ^ index)
+        prefix, type_name, fields = self._layouts[salt % len(self._layouts)]
+        record = {
+            "name": f"{prefix} {index}",
+            "description": f"Описание товара {index}",
+        }
+        if type_name is not None:
+            record["type"] = type_name
+        for field, generate in fields:
+            salt = _mix(salt)
+            record[field] = generate(salt)
+        return record
+
+
+def generate_catalog(
+    count: int,
+    categories: int = 10,
+    seed: int = 0,
+    types: tuple[str, ...] = DEFAULT_TYPES,
+    duplicates: float = 0.1,
+    zero_quantity: float = 0.0,
+) -> Iterator[tuple[str, str, Iterator[dict]]]:
+    """
+    Потоковый каталог из count товаров в categories категориях.
+
+    Возвращает генератор (название, описание, генератор записей товаров);
+    записи категории нужно прочитать до перехода к следующей категории.
+    """
+    if count < 0 or categories <= 0:
+        raise ValueError("Число товаров и категорий должно быть положительным")
+    if not (0 <= duplicates <= 1 and 0 <= zero_quantity <= 1):
+        raise ValueError("Доли дублей и нулевых остатков должны быть от 0 до 1")
+    rng = random.Random(seed)
+    identity = _Identity(seed, tuple(types))
+
+    def products(start: int, stop: int) -> Iterator[dict]:
+        for index in range(start, stop):
+            if index > start and rng.random() < duplicates:
+                index = rng.randrange(start, index)
+            record = identity.record(index)
+            record["price"] = round(rng.uniform(10.0, 200_000.0), 2)
+            if rng.random() < zero_quantity:
+                record["quantity"] = 0
+            else:
+                record["quantity"] = rng.randint(1, 100)
+            yield record
+
+    per_category, extra = divmod(count, categories)
+    start = 0
+    for number in range(categories):
+        stop = start + per_category + (number < extra)
+        yield (
+            f"Категория {number}",
+            f"Описание категории {number}",
+            products(start, stop),
+        )
+        start = stop
+
+
+def write_json(stream, catalog) -> int:
+    """Пишет каталог в формате data/products.json, возвращает число товаров"""
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    written = 0
+    stream.write("[")
+    for number, (name, description, products) in enumerate(catalog):
+        if number:
+            stream.write(",")
+        stream.write(
+            f'\n{{"name": {encode(name)}, "description": {encode(description)}, '
+            f'"products": ['
+        )
+        for position, record in enumerate(products):
+            stream.write(",\n" if position else "\n")
+            stream.write(encode(record))
+            written += 1
+        stream.write("]}")
+    stream.write("\n]\n")
+    return written
+
+
+def write_jsonl(stream, catalog) -> int:
+    """Пишет каталог по товару на строку, возвращает число товаров"""
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    written = 0
+    for name, description, products in catalog:
+        for record in products:
+            record = {"category": name, "category_description": description, **record}
+            stream.write(encode(record))
+            stream.write("\n")
+            written += 1
+    return written
+
+
+WRITERS = {"json": write_json, "jsonl": write_jsonl}
+
+
+def generate_file(file_path, count: int, format: str = "json", **options) -> int:
+    """
+    Записывает синтетический каталог в файл, возвращает число товаров.
+
+    options передаются в generate_catalog.
+    """
+    writer = WRITERS.get(format)
+    if writer is None:
+        raise ValueError(f"Неизвестный формат: {format}")
+    with open(file_path, "w", encoding="utf-8", buffering=1024 * 1024) as file:
+        return writer(file, generate_catalog(count, **options))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file_path")
+    parser.add_argument("--count", type=int, required=True, help="число товаров")
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--format", choices=sorted(WRITERS), default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--types",
+        default=",".join(DEFAULT_TYPES),
+        help="типы товаров через запятую",
+    )
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--zero-quantity", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    written = generate_file(
+        args.file_path,
+        args.count,
+        args.format,
+        categories=args.categories,
+        seed=args.seed,
+        types=tuple(args.types.split(",")),
+        duplicates=args.duplicates,
+        zero_quantity=args.zero_quantity,
+    )
+    print(f"Записано товаров: {written} в {args.file_path}")
+
+
+if __name__ == "__main__":
+    main()
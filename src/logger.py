@@ -0,0 +1,142 @@
+import logging
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Шаблоны текстовых сообщений для событий
+MESSAGES = {
+    "product_created": (
+        "Создан объект класса '{name}', описание: '{description}', "
+        "цена: {price}, кол-во {quantity}"
+    ),
+    "product_added": "Товар добавлен: {name}",
+    "product_add_finished": "Обработка добавления товара завершена",
+    "price_decrease_rejected": "Понижение цены отменено.",
+}
+
+
+def format_event(event: str, fields: dict) -> str:
+    """Текстовое представление события"""
+    template = MESSAGES.get(event)
+    if template is None:
+        return f"{event}: {fields}"
+    return template.format(**fields)
+
+
+class LogBackend(ABC):
+    """
+    Абстрактный базовый класс приёмника событий.
+
+    Вызывающий код проверяет атрибут enabled до того, как собирать поля
+    события, поэтому выключенный приёмник ничего не стоит.
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def emit(self, event: str, **fields):
+        """Обработка события event с полями fields"""
+        pass
+
+
+class ConsoleBackend(LogBackend):
+    """Печать сообщений в stdout (поведение по умолчанию)"""
+
+    def emit(self, event: str, **fields):
+        print(format_event(event, fields))
+
+
+class SilentBackend(LogBackend):
+    """Приёмник, который ничего не делает"""
+
+    enabled = False
+
+    def emit(self, event: str, **fields):
+        pass
+
+
+class LoggingBackend(LogBackend):
+    """Передача событий в модуль logging"""
+
+    def __init__(
+        self, logger: logging.Logger | str = "src", level: int = logging.INFO
+    ):
+        if isinstance(logger, str):
+            logger = logging.getLogger(logger)
+        self.logger = logger
+        self.level = level
+
+    def emit(self, event: str, **fields):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level,
+                format_event(event, fields),
+                extra={"event": event, "fields": fields},
+            )
+
+
+class BufferedBackend(LogBackend):
+    """
+    Накопление структурированных событий в памяти.
+
+    События хранятся как словари {"event": ..., **поля}. Если задан
+    max_events, при переполнении буфер передаётся в sink (если он задан)
+    и очищается.
+    """
+
+    def __init__(self, max_events: int | None = None, sink=None):
+        self.events: list[dict] = []
+        self.max_events = max_events
+        self.sink = sink
+
+    def emit(self, event: str, **fields):
+        fields["event"] = event
+        self.events.append(fields)
+        if self.max_events is not None and len(self.events) >= self.max_events:
+            self.flush()
+
+    def flush(self) -> list[dict]:
+        """Возвращает накопленные события и очищает буфер"""
+        events, self.events = self.events, []
+        if self.sink is not None and events:
+            self.sink(events)
+        return events
+
+
+_backend: LogBackend = ConsoleBackend()
+# Приёмник, установленный use_backend в текущем потоке или задаче asyncio;
+# None - используется глобальный _backend
+_context_backend: ContextVar[LogBackend | None] = ContextVar(
+    "log_backend", default=None
+)
+
+
+def get_backend() -> LogBackend:
+    backend = _context_backend.get()
+    return _backend if backend is None else backend
+
+
+def set_backend(backend: LogBackend) -> LogBackend:
+    """Глобально устанавливает приёмник событий, возвращает предыдущий"""
+    global _backend
+    if not isinstance(backend, LogBackend):
+        raise ValueError("Приёмник должен быть экземпляром LogBackend")
+    previous, _backend = _backend, backend
+    return previous
+
+
+@contextmanager
+def use_backend(backend: LogBackend):
+    """
+    Временно устанавливает приёмник событий на время блока with.
+
+    Приёмник хранится в ContextVar, поэтому действует только в текущем
+    потоке или задаче asyncio, а не во всём процессе.
+    """
+    if not isinstance(backend, LogBackend):
+        raise ValueError("Приёмник должен быть экземпляром LogBackend")
+    token = _context_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _context_backend.reset(token)
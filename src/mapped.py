@@ -0,0 +1,150 @@
+"""
+Каталог только для чтения поверх файла снимка, отображённого в память.
+
+Файл открывается через mmap без копирования: несколько процессов на одном
+хосте читают одни и те же страницы из кэша ОС. Агрегаты категорий
+считаются прямо по секциям снимка, а объекты Product создаются только
+при обращении к конкретному товару.
+"""
+
+import mmap
+from contextlib import suppress
+from typing import Iterator
+
+from src.category import Category
+from src.product import Product
+from src.snapshot import product_record, read_sections
+
+
+class MappedCategory:
+    """Категория снимка, аналог Category только для чтения"""
+
+    def __init__(self, catalog: "MappedCatalog", index: int):
+        self._catalog = catalog
+        self._index = index
+        starts = catalog._sections["category_starts"]
+        self._start = starts[index]
+        self._stop = starts[index + 1]
+
+    @property
+    def name(self) -> str:
+        sections = self._catalog._sections
+        return self._catalog._string(sections["category_names"][self._index])
+
+    @property
+    def description(self) -> str:
+        sections = self._catalog._sections
+        return self._catalog._string(sections["category_descriptions"][self._index])
+
+    @property
+    def category_product_count(self) -> int:
+        return self._stop - self._start
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __str__(self):
+        return f"{self.name}, количество продуктов: {self.calculate_total()}"
+
+    def calculate_total(self) -> int:
+        return sum(self._catalog._sections["quantities"][self._start : self._stop])
+
+    def middle_price(self) -> float:
+        # если товаров в категории нет - возвращаю ноль
+        if self._stop == self._start:
+            return 0
+        prices = self._catalog._sections["prices"][self._start : self._stop]
+        return sum(prices) / len(prices)
+
+    def product(self, index: int) -> Product:
+        """Товар категории нужного типа, создаётся при обращении"""
+        if not -len(self) <= index < len(self):
+            raise IndexError("Индекс за пределами категории")
+        position = self._start + index % len(self)
+        catalog = self._catalog
+        sections = catalog._sections
+        type_name = catalog._string(sections["product_types"][position])
+        name = catalog._string(sections["product_names"][position])
+        description = catalog._string(sections["product_descriptions"][position])
+        price, quantity = sections["prices"][position], sections["quantities"][position]
+        if type_name == "product":
+            return Product(name, description, price, quantity)
+        extras = catalog._string(sections["product_extras"][position])
+        record = product_record(type_name, extras, name, description, price, quantity)
+        return Product.from_records([record])[0]
+
+    def __getitem__(self, index: int) -> Product:
+        return self.product(index)
+
+    def __iter__(self) -> Iterator[Product]:
+        for index in range(len(self)):
+            yield self.product(index)
+
+    def to_category(self) -> Category:
+        """Копия категории в виде обычного изменяемого Category"""
+        return Category.restore(self.name, self.description, list(self))
+
+
+class MappedCatalog:
+    """
+    Каталог из файла снимка (см. src.snapshot), отображённого в память.
+
+    Используется как контекстный менеджер или закрывается методом close().
+    Категории доступны по индексу и по названию, изменения не поддерживаются.
+    """
+
+    def __init__(self, file_path, verify: bool = True):
+        with open(file_path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections = read_sections(self._mmap, verify)
+        except BaseException:
+            # Разобранные секции могут оставаться в кадрах исключения,
+            # тогда отображение закроется при их освобождении
+            with suppress(BufferError):
+                self._mmap.close()
+            raise
+        self.categories = [
+            MappedCategory(self, index)
+            for index in range(len(self._sections["category_names"]))
+        ]
+
+    def _string(self, index: int) -> str:
+        offsets = self._sections["string_offsets"]
+        data = self._sections["strings"][offsets[index] : offsets[index + 1]]
+        return data.tobytes().decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __iter__(self) -> Iterator[MappedCategory]:
+        return iter(self.categories)
+
+    def __getitem__(self, index: int) -> MappedCategory:
+        return self.categories[index]
+
+    def category(self, name: str) -> MappedCategory:
+        """Первая категория с названием name, KeyError - если такой нет"""
+        for category in self.categories:
+            if category.name == name:
+                return category
+        raise KeyError(name)
+
+    @property
+    def product_count(self) -> int:
+        return len(self._sections["prices"])
+
+    def close(self):
+        """Освобождает отображение файла"""
+        if self._mmap.closed:
+            return
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
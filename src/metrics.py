@@ -0,0 +1,248 @@
+"""
+Счётчики и гистограммы задержек горячих путей.
+
+Инструментирование включается по желанию, как приёмники событий в
+src.logger: по умолчанию установлен DisabledMetrics, у которого
+enabled = False. Вызывающий код проверяет enabled до того, как засекать
+время и собирать метки, поэтому выключенные метрики почти ничего не
+стоят.
+
+    with use_metrics(MetricsRegistry()) as metrics:
+        load_data_from_json("data/products.json")
+    metrics.to_dict()        # словарь для JSON
+    metrics.to_prometheus()  # текстовый формат Prometheus
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Границы корзин гистограмм задержек по умолчанию, в секундах
+DEFAULT_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+# Описания метрик, которые пишут модули пакета: имя -> (вид, описание)
+METRICS = {
+    "products_created_total": ("counter", "Созданные товары по типу"),
+    "product_init_seconds": ("histogram", "Время конструктора товара"),
+    "product_batch_seconds": (
+        "histogram",
+        "Время пакетного создания товаров (from_records, from_columns)",
+    ),
+    "product_validation_errors_total": (
+        "counter",
+        "Ошибки проверки полей товара по типу",
+    ),
+    "category_products_added_total": ("counter", "Товары, добавленные в категории"),
+    "category_add_rejected_total": (
+        "counter",
+        "Товары с нулевым количеством, отклонённые категорией",
+    ),
+    "category_add_product_seconds": ("histogram", "Время Category.add_product"),
+    "order_lines_total": ("counter", "Строки, добавленные в заказы, по операции"),
+    "order_rejected_total": (
+        "counter",
+        "Отклонённые вызовы и строки заказов по операции",
+    ),
+    "order_place_seconds": ("histogram", "Время оформления заказа по операции"),
+    "json_load_seconds": ("histogram", "Время фаз загрузки каталога из JSON"),
+    "json_load_categories_total": ("counter", "Категории, загруженные из JSON"),
+}
+
+
+class DisabledMetrics:
+    """Выключенные метрики: все методы ничего не делают"""
+
+    enabled = False
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def timer(self, name: str, **labels):
+        return nullcontext()
+
+    def timed(self, iterable, name: str, **labels):
+        return iterable
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        # Последняя корзина - значения больше всех границ (+Inf)
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry(DisabledMetrics):
+    """
+    Включённые метрики: счётчики и гистограммы с метками.
+
+    Значение хранится по ключу (имя, метки). Обновления выполняются под
+    блокировкой, поэтому метрики можно писать из нескольких потоков.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, _Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Увеличивает счётчик name с метками labels на amount"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        """Добавляет значение value (например, задержку в секундах) в гистограмму"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.counts[bisect_left(histogram.bounds, value)] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Записывает время выполнения блока with в гистограмму name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, iterable, name: str, **labels):
+        """Итератор по iterable, время получения каждого элемента пишется в name"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(name, time.perf_counter() - start, **labels)
+            yield item
+
+    def reset(self):
+        """Обнуляет все метрики"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Метрики в виде словаря:
+        {имя: {"type": вид, "samples": [{"labels": {...}, ...}]}}.
+
+        У счётчика в образце поле value, у гистограммы - count, sum и
+        buckets {граница: число значений не больше границы}.
+        """
+        result = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = result.setdefault(name, {"type": "counter", "samples": []})
+                metric["samples"].append({"labels": dict(labels), "value": value})
+            for (name, labels), histogram in sorted(
+                self._histograms.items(), key=lambda item: item[0]
+            ):
+                metric = result.setdefault(name, {"type": "histogram", "samples": []})
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                metric["samples"].append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": buckets,
+                    }
+                )
+        return result
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        lines = []
+        for name, metric in self.to_dict().items():
+            description = METRICS.get(name, (None, ""))[1]
+            if description:
+                lines.append(f"# HELP {name} {_escape(description, help=True)}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for sample in metric["samples"]:
+                labels = sample["labels"]
+                if metric["type"] == "counter":
+                    lines.append(f"{name}{_labels(labels)} {_number(sample['value'])}")
+                    continue
+                for bound, count in sample["buckets"].items():
+                    bucket_labels = _labels({**labels, "le": _number(bound)})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                inf_labels = _labels({**labels, "le": "+Inf"})
+                lines.append(f"{name}_bucket{inf_labels} {sample['count']}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(sample['sum'])}")
+                lines.append(f"{name}_count{_labels(labels)} {sample['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str, help: bool = False) -> str:
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value if help else value.replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_metrics: DisabledMetrics = DisabledMetrics()
+# Метрики, установленные use_metrics в текущем потоке или задаче asyncio;
+# None - используются глобальные _metrics
+_context_metrics: ContextVar[DisabledMetrics | None] = ContextVar(
+    "metrics", default=None
+)
+
+
+def get_metrics() -> DisabledMetrics:
+    metrics = _context_metrics.get()
+    return _metrics if metrics is None else metrics
+
+
+def set_metrics(metrics: DisabledMetrics) -> DisabledMetrics:
+    """Глобально устанавливает метрики, возвращает предыдущие"""
+    global _metrics
+    if not isinstance(metrics, DisabledMetrics):
+        raise ValueError("Метрики должны быть экземпляром DisabledMetrics")
+    previous, _metrics = _metrics, metrics
+    return previous
+
+
+@contextmanager
+def use_metrics(metrics: DisabledMetrics):
+    """
+    Временно устанавливает метрики на время блока with, только в текущем
+    потоке или задаче asyncio (как use_backend в src.logger).
+    """
+    if not isinstance(metrics, DisabledMetrics):
+        raise ValueError("Метрики должны быть экземпляром DisabledMetrics")
+    token = _context_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _context_metrics.reset(token)
@@ -1,16 +1,54 @@
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import repeat
+from operator import itemgetter
+from time import perf_counter
+from typing import Iterable
+
+from src.logger import get_backend
+from src.metrics import get_metrics
+
+# Политики понижения цены
+PRICE_POLICY_ASK = "ask"  # запросить подтверждение через input()
+PRICE_POLICY_APPROVE = "approve"  # понижать без подтверждения
+PRICE_POLICY_REJECT = "reject"  # отклонять любое понижение
+
+# Поле записи с типом товара, см. register_product_type
+PRODUCT_TYPE_FIELD = "type"
+
+# Блокировки остатков: товар по своему id попадает в одну из полос,
+# поэтому отдельная блокировка на каждый товар не нужна
+_STOCK_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+def _stock_lock(product) -> threading.Lock:
+    return _STOCK_LOCKS[(id(product) >> 4) % len(_STOCK_LOCKS)]
 
 
 class LoggingMixin:
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         # Product('Продукт1', 'Описание продукта', 1200, 10)
-        print(
-            f"Создан объект класса '{args[0]}', описание: '{args[1]}', цена: {args[2]}, кол-во {args[3]}"
-        )
+        # Сообщение уходит в текущий приёмник событий (см. src.logger)
+        backend = get_backend()
+        if backend.enabled:
+            backend.emit(
+                "product_created",
+                name=args[0],
+                description=args[1],
+                price=args[2],
+                quantity=args[3],
+            )
         # super().__init__(*args, **kwargs)
 
 
 class BaseProduct(ABC):
+    # Атрибуты хранятся в слотах, а не в __dict__ экземпляра
+    # цена и количество хранятся в наследниках: в Product это свойства
+    __slots__ = ("name", "description")
+
     name: str  # название
     description: str  # описание
     __price: float  # цена
@@ -18,26 +56,54 @@ class BaseProduct(ABC):
 
     @abstractmethod
     def __init__(self, name: str, description: str, price: float, quantity: int):
+        # Цена и количество хранятся в слотах наследников, здесь только
+        # проверка всех полей и общие атрибуты
+        self._validate(name, description, price, quantity)
+        self.name = name
+        self.description = description
+
+    @staticmethod
+    def _validate(name, description, price, quantity):
+        """Проверка полей товара, общая для конструкторов"""
         # Валидация имени
         if not isinstance(name, str) or not name:
             raise ValueError("Название должно быть непустой строкой")
-        self.name = name
 
         # Валидация описания
         if not isinstance(description, str) or not description:
             raise ValueError("Описание должно быть непустой строкой")
-        self.description = description
 
         # Валидация цены
         if not isinstance(price, (int, float)) or price <= 0:
             print("Цена не должна быть нулевая или отрицательная")
             raise ValueError("Цена не должна быть нулевая или отрицательная")
-        self.__price = float(price)
 
         # Валидация количества
         if not isinstance(quantity, int) or quantity < 0:
             raise ValueError("Количество должно быть положительным целым числом")
-        self.quantity = quantity
+
+    @staticmethod
+    def _validate_columns(names, descriptions, prices, quantities):
+        """
+        Проверка полей товаров целыми столбцами.
+
+        Правила те же, что в _validate, но каждый столбец проверяется
+        одним проходом встроенных функций all/map/min.
+        """
+        if not len(names) == len(descriptions) == len(prices) == len(quantities):
+            raise ValueError("Столбцы должны быть одинаковой длины")
+        if not names:
+            return
+        if not all(map(isinstance, names, repeat(str))) or not all(names):
+            raise ValueError("Название должно быть непустой строкой")
+        if not all(map(isinstance, descriptions, repeat(str))) or not all(
+            descriptions
+        ):
+            raise ValueError("Описание должно быть непустой строкой")
+        if not all(map(isinstance, prices, repeat((int, float)))) or min(prices) <= 0:
+            raise ValueError("Цена не должна быть нулевая или отрицательная")
+        if not all(map(isinstance, quantities, repeat(int))) or min(quantities) < 0:
+            raise ValueError("Количество должно быть положительным целым числом")
 
     @abstractmethod
     def __str__(self):
@@ -64,31 +130,155 @@ class BaseProduct(ABC):
 
 
 class Product(BaseProduct, LoggingMixin):
+    # __categories - категории, в которые добавлен товар (None, пока их нет)
+    __slots__ = ("__price", "__quantity", "__categories")
+    # Политика понижения цены: одна из PRICE_POLICY_* или функция
+    # (product, old_price, new_price) -> bool
+    price_decrease_policy = PRICE_POLICY_ASK
+    # Дополнительные поля наследников для пакетного создания:
+    # (поле, допустимые типы, правило "nonempty" | "positive" | "non_negative",
+    #  сообщение об ошибке)
+    field_checks: tuple = ()
 
     def __init__(self, name: str, description: str, price: float, quantity: int):
-        # super().__init__(name, description, price, quantity)
-        BaseProduct.__init__(self, name, description, price, quantity)
-        LoggingMixin.__init__(self, name, description, price, quantity)
-        # Валидация имени
-        if not isinstance(name, str) or not name:
-            raise ValueError("Название должно быть непустой строкой")
+        metrics = get_metrics()
+        measured = metrics.enabled
+        if measured:
+            start = perf_counter()
+        # Поля проверяются один раз, без повторного вызова BaseProduct.__init__
+        try:
+            self._validate(name, description, price, quantity)
+        except ValueError:
+            if measured:
+                metrics.inc("product_validation_errors_total", type=type(self).__name__)
+            raise
+        self.__categories = None
         self.name = name
-
-        # Валидация описания
-        if not isinstance(description, str) or not description:
-            raise ValueError("Описание должно быть непустой строкой")
         self.description = description
-
-        # Валидация цены
-        if not isinstance(price, (int, float)) or price <= 0:
-            print("Цена не должна быть нулевая или отрицательная")
-            raise ValueError("Цена не должна быть нулевая или отрицательная")
         self.__price = float(price)
+        self.__quantity = quantity
+        LoggingMixin.__init__(self, name, description, price, quantity)
+        if measured:
+            type_name = type(self).__name__
+            metrics.inc("products_created_total", type=type_name)
+            metrics.observe(
+                "product_init_seconds", perf_counter() - start, type=type_name
+            )
 
-        # Валидация количества
-        if not isinstance(quantity, int) or quantity < 0:
-            raise ValueError("Количество должно быть положительным целым числом")
-        self.quantity = quantity
+    @classmethod
+    def from_records(cls, records) -> list["Product"]:
+        """
+        Пакетное создание товаров.
+
+        records - итерируемый набор словарей в формате data/products.json
+        или кортежей (name, description, price, quantity, *доп. поля).
+        Словарь с полем "type" создаётся классом, зарегистрированным под
+        этим типом (см. register_product_type), остальные записи - классом
+        cls. Поля проверяются целыми столбцами заранее собранными проверками
+        типа, затем объекты создаются без повторных проверок. При ошибке не
+        создаётся ни один товар. Порядок товаров совпадает с порядком записей.
+        """
+        # Записи раскладываются по группам с одинаковым значением поля type
+        # (кортежи - отдельная группа с ключом tuple); порядок групп по
+        # записям запоминается, только если встретилась вторая группа
+        lanes: dict = {}
+        order: list | None = None
+        for record in records:
+            key = record.get(PRODUCT_TYPE_FIELD) if isinstance(record, dict) else tuple
+            lane = lanes.get(key)
+            if lane is None:
+                lane = lanes[key] = []
+                if len(lanes) == 2:
+                    first = next(iter(lanes))
+                    order = [first] * len(lanes[first])
+            if order is not None:
+                order.append(key)
+            lane.append(record)
+
+        # Сначала проверяются все группы, чтобы при ошибке не создавать товары
+        targets = {
+            key: cls if key is None or key is tuple else _resolve_type(key, cls)
+            for key in lanes
+        }
+        columns = {
+            key: _record_schema(targets[key]).columns(rows, key is tuple)
+            for key, rows in lanes.items()
+        }
+        created = {}
+        for key, rows in lanes.items():
+            target = targets[key]
+            if columns[key] is not None:
+                created[key] = target._create(*columns[key])
+            elif key is tuple:
+                created[key] = [target(*row) for row in rows]
+            else:
+                created[key] = [target(**_constructor_arguments(row)) for row in rows]
+        if order is None:
+            return created.popitem()[1] if created else []
+        iterators = {key: iter(products) for key, products in created.items()}
+        return [next(iterators[key]) for key in order]
+
+    @classmethod
+    def from_columns(
+        cls, names, descriptions, prices, quantities, **extra_columns
+    ) -> list["Product"]:
+        """
+        Пакетное создание товаров из столбцов значений.
+
+        Дополнительные поля наследников передаются столбцами по имени:
+        Smartphone.from_columns(..., efficiency=[...], model=[...], ...).
+        """
+        schema = _record_schema(cls)
+        if schema.extra_fields is None:
+            raise TypeError(f"Для {cls.__name__} не заданы field_checks")
+        if set(extra_columns) != set(schema.extra_fields):
+            raise TypeError(
+                f"Для {cls.__name__} нужны столбцы: {', '.join(schema.extra_fields)}"
+            )
+        columns = [names, descriptions, prices, quantities]
+        columns.extend(extra_columns[field] for field in schema.extra_fields)
+        schema.validate_columns(columns)
+        return cls._create(*columns)
+
+    @classmethod
+    def _create(cls, names, descriptions, prices, quantities, *extra_columns):
+        """Создание уже проверенных товаров без вызова __init__"""
+        metrics = get_metrics()
+        if metrics.enabled:
+            start = perf_counter()
+        backend = get_backend()
+        log_enabled = backend.enabled
+        products = []
+        append = products.append
+        new = cls.__new__
+        for name, description, price, quantity in zip(
+            names, descriptions, prices, quantities
+        ):
+            product = new(cls)
+            product.__categories = None
+            product.name = name
+            product.description = description
+            product.__price = float(price)
+            product.__quantity = quantity
+            if log_enabled:
+                backend.emit(
+                    "product_created",
+                    name=name,
+                    description=description,
+                    price=price,
+                    quantity=quantity,
+                )
+            append(product)
+        if extra_columns:
+            for field, column in zip(_record_schema(cls).extra_fields, extra_columns):
+                # map вместо цикла: присваивание идёт без интерпретатора
+                deque(map(setattr, products, repeat(field), column), maxlen=0)
+        if metrics.enabled:
+            metrics.inc("products_created_total", len(products), type=cls.__name__)
+            metrics.observe(
+                "product_batch_seconds", perf_counter() - start, type=cls.__name__
+            )
+        return products
 
     def __str__(self) -> str:
         # Название продукта, 80 руб. Остаток: 15 шт.
@@ -107,49 +297,193 @@ class Product(BaseProduct, LoggingMixin):
 
     @price.setter
     def price(self, new_price):
+        self.set_price(new_price)
+
+    def set_price(self, new_price, policy=None) -> bool:
+        """
+        Установка цены с учётом политики понижения.
+
+        policy переопределяет Product.price_decrease_policy для этого вызова.
+        Возвращает True, если цена установлена, и False, если понижение отклонено.
+        """
         if not isinstance(new_price, (int, float)) or new_price <= 0:
             print("Цена не должна быть нулевая или отрицательная")
             raise ValueError("Цена не должна быть нулевая или отрицательная")
-        elif new_price < self.__price:
+        elif new_price < self.__price and not self._approve_price_decrease(
+            new_price, policy
+        ):
+            backend = get_backend()
+            if backend.enabled:
+                backend.emit("price_decrease_rejected", name=self.name)
+            return False
+        self.__apply_price(new_price)
+        return True
+
+    def _approve_price_decrease(self, new_price, policy=None) -> bool:
+        if policy is None:
+            policy = self.price_decrease_policy
+        if policy == PRICE_POLICY_ASK:
             user_input = input(
                 "Цена товара будет понижена. Подтвердите действие (y/n): "
             )
-            if user_input.lower() == "y":
-                self.__price = new_price
-            else:
-                print("Понижение цены отменено.")
+            return user_input.lower() == "y"
+        if policy == PRICE_POLICY_APPROVE:
+            return True
+        if policy == PRICE_POLICY_REJECT:
+            return False
+        if callable(policy):
+            return bool(policy(self, self.__price, new_price))
+        raise ValueError(f"Неизвестная политика понижения цены: {policy!r}")
+
+    def __apply_price(self, new_price):
+        # Под блокировкой товара, как и в Category.add_product: иначе
+        # категория может учесть в суммах цену, которую уже сменили
+        with _stock_lock(self):
+            old_price, self.__price = self.__price, new_price
+            if self.__categories:
+                for category in self.__categories:
+                    category._product_price_changed(self, old_price, new_price)
+
+    @property
+    def quantity(self):
+        return self.__quantity
+
+    @quantity.setter
+    def quantity(self, new_quantity):
+        with _stock_lock(self):
+            self._set_quantity(new_quantity)
+
+    def _set_quantity(self, new_quantity):
+        """Изменение количества, вызывающий уже держит _stock_lock(self)"""
+        if self.__categories:
+            old_quantity, self.__quantity = self.__quantity, new_quantity
+            for category in self.__categories:
+                category._product_quantity_changed(self, old_quantity, new_quantity)
         else:
-            self.__price = new_price
+            self.__quantity = new_quantity
+
+    def reserve(self, quantity: int):
+        """
+        Атомарно списывает quantity единиц товара со склада.
+
+        Проверка остатка и списание выполняются под блокировкой, поэтому
+        параллельные заказы не продадут больше, чем есть в наличии.
+        """
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Некорректное количество товара")
+        with _stock_lock(self):
+            if self.__quantity < quantity:
+                raise ValueError("Некорректное количество товара")
+            self._set_quantity(self.__quantity - quantity)
+
+    def restock(self, quantity: int):
+        """Атомарно возвращает (добавляет) quantity единиц товара на склад"""
+        if not isinstance(quantity, int) or quantity < 0:
+            raise ValueError("Количество должно быть положительным целым числом")
+        with _stock_lock(self):
+            self._set_quantity(self.__quantity + quantity)
+
+    def __getstate__(self):
+        """
+        Состояние для copy и pickle без подписок на категории: копия товара
+        не входит ни в одну категорию и не меняет её суммы.
+        """
+        # У наследников без __slots__ есть и словарь экземпляра
+        state, slots = super().__getstate__()
+        slots = dict(slots or {})
+        slots.pop("_Product__categories", None)
+        return state, slots
+
+    def __setstate__(self, state):
+        state, slots = state
+        self.__categories = None
+        if state:
+            self.__dict__.update(state)
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
+
+    def __copy__(self):
+        clone = type(self).__new__(type(self))
+        clone.__setstate__(self.__getstate__())
+        return clone
+
+    def _attach_category(self, category):
+        """Подписывает категорию на изменения цены и количества товара"""
+        if self.__categories is None:
+            self.__categories = [category]
+        else:
+            self.__categories.append(category)
+
+    def _detach_category(self, category):
+        """Отписывает категорию от изменений товара"""
+        if self.__categories:
+            for index, attached in enumerate(self.__categories):
+                if attached is category:
+                    del self.__categories[index]
+                    break
+            if not self.__categories:
+                self.__categories = None
 
     @classmethod
     def new_product(cls, product_data: dict, products=None):
+        """
+        Создаёт товар или объединяет его с уже существующим товаром того же имени.
+
+        products - список товаров (поиск перебором) или словарь
+        {название: товар} (поиск за O(1)). В словарь новый товар
+        добавляется автоматически, так что его можно переиспользовать
+        как индекс при загрузке большого потока записей.
+        """
         name = product_data.get("name")
         description = product_data.get("description")
         price = product_data.get("price")
         quantity = product_data.get("quantity")
+        cls._validate(name, description, price, quantity)
 
-        if not isinstance(name, str) or not name:
-            raise ValueError("Название должно быть непустой строкой")
-        if not isinstance(description, str) or not description:
-            raise ValueError("Описание должно быть непустой строкой")
-        if not isinstance(price, (int, float)) or price <= 0:
-            raise ValueError("Цена не должна быть нулевая или отрицательная")
-        if not isinstance(quantity, int) or quantity < 0:
-            raise ValueError("Количество должно быть положительным целым числом")
+        if isinstance(products, dict):
+            product = products.get(name)
+            if product is None:
+                product = products[name] = cls(**product_data)
+            else:
+                product._merge(price, quantity)
+            return product
 
         if products:
             for product in products:
                 if product.name == name:
                     # Если товар с таким именем уже существует, обновляем его параметры
-                    product.quantity += quantity
-                    if price > product.price:
-                        product.price = price
+                    product._merge(price, quantity)
                     return product
 
         return cls(**product_data)  # cls(name, description, price, quantity)
 
+    def _merge(self, price: float, quantity: int):
+        """Объединение с дублем: количество суммируется, цена берётся большая"""
+        self.restock(quantity)
+        if price > self.price:
+            self.price = price
+
 
 class Smartphone(Product):
+    __slots__ = ("efficiency", "model", "memory", "color")
+    field_checks = (
+        (
+            "efficiency",
+            float,
+            "positive",
+            "Производительность должна быть не отрицательная "
+            "переменная с плавающей точкой",
+        ),
+        ("model", str, "nonempty", "Описание должно быть непустой строкой"),
+        (
+            "memory",
+            int,
+            "non_negative",
+            "Объём памяти должен быть целочисленным больше нуля",
+        ),
+        ("color", str, "nonempty", "Цвет должен быть непустой строкой"),
+    )
+
     efficiency: float  # производительность
     model: str  # модель
     memory: int  # объем встроенной памяти
@@ -191,6 +525,23 @@ class Smartphone(Product):
 
 
 class LawnGrass(Product):
+    __slots__ = ("country", "germination_period", "color")
+    field_checks = (
+        (
+            "country",
+            str,
+            "nonempty",
+            "Страна-производитель должена быть непустой строкой",
+        ),
+        (
+            "germination_period",
+            int,
+            "non_negative",
+            "Срок прорастания должен быть целочисленной переменной больше нуля",
+        ),
+        ("color", str, "nonempty", "Цвет должен быть непустой строкой"),
+    )
+
     country: str  # страна-производитель
     germination_period: int  # срок прорастания
     color: str  # цвет
@@ -220,3 +571,156 @@ class LawnGrass(Product):
         if not isinstance(color, str) or not color:
             raise ValueError("Цвет должен быть непустой строкой")
         self.color = color
+
+
+# Правила проверки столбца дополнительного поля, столбец не пустой
+_COLUMN_RULES = {
+    "nonempty": all,
+    "positive": lambda column: min(column) > 0,
+    "non_negative": lambda column: min(column) >= 0,
+}
+
+
+def _compile_check(field: str, types, rule: str, message: str):
+    """Собирает проверку столбца одного поля, см. Product.field_checks"""
+    if rule not in _COLUMN_RULES:
+        raise ValueError(f"Неизвестное правило проверки поля '{field}': {rule}")
+    satisfies = _COLUMN_RULES[rule]
+
+    def check(column):
+        if column and (
+            not all(map(isinstance, column, repeat(types))) or not satisfies(column)
+        ):
+            raise ValueError(message)
+
+    return check
+
+
+def _require_fields(record: dict, fields: Iterable[str]):
+    """ValueError, если в записи товара нет одного из полей"""
+    for field in fields:
+        if field not in record:
+            raise ValueError(f"В записи товара нет поля {field}")
+
+
+def _constructor_arguments(record: dict) -> dict:
+    return {key: value for key, value in record.items() if key != PRODUCT_TYPE_FIELD}
+
+
+class _RecordSchema:
+    """Заранее собранные средства разбора и проверки записей одного класса"""
+
+    __slots__ = (
+        "type_name",
+        "extra_fields",
+        "field_getters",
+        "position_getters",
+        "checks",
+    )
+
+    def __init__(self, cls: type):
+        self.type_name = cls.__name__
+        # Класс, конструктор которого создаёт объекты cls
+        owner = next(klass for klass in cls.__mro__ if "__init__" in vars(klass))
+        if owner is not Product and "field_checks" not in vars(owner):
+            # Поля конструктора неизвестны - объекты создаются через cls(**запись)
+            self.extra_fields = self.field_getters = None
+            self.position_getters = self.checks = None
+            return
+        specs = cls.field_checks
+        self.extra_fields = tuple(spec[0] for spec in specs)
+        fields = ("name", "description", "price", "quantity", *self.extra_fields)
+        self.field_getters = tuple(itemgetter(field) for field in fields)
+        self.position_getters = tuple(itemgetter(i) for i in range(len(fields)))
+        self.checks = tuple(_compile_check(*spec) for spec in specs)
+
+    def columns(self, records: list, positional: bool) -> list | None:
+        """
+        Столбцы значений полей для записей-словарей или кортежей.
+
+        Каждый столбец извлекается одним проходом map, затем проверяется.
+        None - класс создаётся только через конструктор.
+        """
+        if self.field_getters is None:
+            return None
+        if positional:
+            if set(map(len, records)) != {len(self.position_getters)}:
+                raise ValueError(
+                    f"Запись товара должна содержать {len(self.position_getters)} полей"
+                )
+            getters = self.position_getters
+        else:
+            getters = self.field_getters
+        try:
+            columns = [list(map(getter, records)) for getter in getters]
+        except KeyError as error:
+            raise ValueError(f"В записи товара нет поля {error.args[0]}") from None
+        self.validate_columns(columns)
+        return columns
+
+    def validate_columns(self, columns: list):
+        try:
+            Product._validate_columns(*columns[:4])
+            for check, column in zip(self.checks, columns[4:]):
+                if len(column) != len(columns[0]):
+                    raise ValueError("Столбцы должны быть одинаковой длины")
+                check(column)
+        except ValueError:
+            metrics = get_metrics()
+            if metrics.enabled:
+                metrics.inc("product_validation_errors_total", type=self.type_name)
+            raise
+
+
+# {тип из поля "type": класс товара}
+_PRODUCT_TYPES: dict[str, type] = {}
+_SCHEMAS: dict[type, _RecordSchema] = {}
+
+
+def _record_schema(cls: type) -> _RecordSchema:
+    schema = _SCHEMAS.get(cls)
+    if schema is None:
+        schema = _SCHEMAS[cls] = _RecordSchema(cls)
+    return schema
+
+
+def register_product_type(type_name: str, cls: type):
+    """
+    Регистрирует класс товара под значением поля "type" в записях.
+
+    Проверки дополнительных полей (cls.field_checks) собираются один раз
+    при регистрации.
+    """
+    if not isinstance(cls, type) or not issubclass(cls, Product):
+        raise ValueError("Тип товара должен быть подклассом Product")
+    _SCHEMAS[cls] = _RecordSchema(cls)
+    _PRODUCT_TYPES[type_name] = cls
+
+
+def _resolve_type(type_name: str, base: type) -> type:
+    """Класс товара по типу из записи, который должен наследовать base"""
+    cls = product_class(type_name)
+    if not issubclass(cls, base):
+        raise ValueError(f"Тип товара '{type_name}' не является {base.__name__}")
+    return cls
+
+
+def product_class(type_name: str) -> type:
+    """Класс товара по значению поля "type", ValueError - если тип не зарегистрирован"""
+    cls = _PRODUCT_TYPES.get(type_name)
+    if cls is None:
+        raise ValueError(f"Неизвестный тип товара: {type_name}")
+    return cls
+
+
+def product_type_name(cls: type) -> str:
+    """Значение поля "type" для класса, ValueError - если класс не зарегистрирован"""
+    for type_name, registered in _PRODUCT_TYPES.items():
+        if registered is cls:
+            return type_name
+    raise ValueError(f"Класс {cls.__name__} не зарегистрирован как тип товара")
+
+
+register_product_type("product", Product)
+register_product_type("smartphone", Smartphone)
+register_product_type("lawn_grass", LawnGrass)
@@ -0,0 +1,82 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+from src.category import Category, Order
+from src.product import PRICE_POLICY_REJECT, Product
+
+
+class InventoryService:
+    """
+    Асинхронный фасад над Product, Order и Category для asyncio-приложений.
+
+    Списание остатка атомарно уже в Product.reserve, поэтому тысячи
+    конкурентных корутин не продадут больше, чем есть на складе, и не
+    требуют потоков. Синхронные методы не уступают цикл событий, и
+    блокировка им не нужна. Оформления заказов одного товара с
+    подтверждением выполняются по очереди под asyncio.Lock товара. Методы
+    никогда не обращаются к input(): понижение цены решается политикой
+    price_decrease_policy.
+    """
+
+    def __init__(self, price_decrease_policy=PRICE_POLICY_REJECT):
+        self.price_decrease_policy = price_decrease_policy
+        # {id(товара): [блокировка, число ожидающих и владеющих корутин]}
+        self._locks: dict[int, list] = {}
+
+    @asynccontextmanager
+    async def _lock(self, product: Product):
+        """
+        Блокировка одного товара. Запись удаляется, когда её отпускает
+        последняя корутина: словарь не растёт, а пока запись есть, товар
+        жив, и его id не может достаться другому объекту.
+        """
+        key = id(product)
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    async def reserve(self, product: Product, quantity: int):
+        """Списывает quantity единиц товара, ValueError - если не хватает"""
+        product.reserve(quantity)
+
+    async def place_order(
+        self,
+        product: Product,
+        quantity: int,
+        confirm: Callable[[Order], Awaitable] | None = None,
+    ) -> Order:
+        """
+        Оформляет заказ.
+
+        confirm - необязательная корутинная функция (оплата, запись в базу),
+        которая вызывается с заказом, пока товар заблокирован. Если она
+        завершится ошибкой, товар возвращается на склад, а ошибка
+        пробрасывается дальше. Подтверждения разных товаров не ждут друг
+        друга.
+        """
+        async with self._lock(product):
+            order = Order(product, quantity)
+            if confirm is not None:
+                try:
+                    await confirm(order)
+                except BaseException:
+                    product.restock(quantity)
+                    raise
+            return order
+
+    async def add_product(self, category: Category, product: Product):
+        """Добавляет товар в категорию"""
+        category.add_product(product)
+
+    async def set_price(self, product: Product, new_price: float) -> bool:
+        """Меняет цену по политике сервиса; False - понижение отклонено"""
+        return product.set_price(new_price, self.price_decrease_policy)
@@ -0,0 +1,253 @@
+"""
+Двоичный снимок каталога для быстрого старта.
+
+Формат файла (little-endian):
+    заголовок HEADER: магия b"PCAT", версия, флаги, число строк, категорий
+    и товаров, CRC32 всех данных после заголовка;
+    далее секции в порядке SECTIONS - массивы фиксированной ширины
+    (смещения строк, границы категорий, цены, количества, индексы строк)
+    и в конце таблица строк в UTF-8.
+
+Каждая строка (название, описание) хранится один раз. Тип товара (значение
+поля "type", см. register_product_type) и дополнительные поля наследников
+хранятся индексами строк: дополнительные поля - объектом JSON, у Product
+это пустая строка. Числовые секции выровнены по своему размеру, поэтому
+файл можно читать и через mmap (см. src.mapped).
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+from src.category import Category
+from src.product import Product, _record_schema, product_type_name
+
+MAGIC = b"PCAT"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQQQII")
+
+# (имя секции, тип элементов array, длина в зависимости от числа строк,
+#  категорий и товаров)
+SECTIONS = (
+    ("string_offsets", "Q", lambda strings, categories, products: strings + 1),
+    ("category_starts", "Q", lambda strings, categories, products: categories + 1),
+    ("prices", "d", lambda strings, categories, products: products),
+    ("quantities", "q", lambda strings, categories, products: products),
+    ("category_names", "I", lambda strings, categories, products: categories),
+    ("category_descriptions", "I", lambda strings, categories, products: categories),
+    ("product_names", "I", lambda strings, categories, products: products),
+    ("product_descriptions", "I", lambda strings, categories, products: products),
+    ("product_types", "I", lambda strings, categories, products: products),
+    ("product_extras", "I", lambda strings, categories, products: products),
+)
+
+
+def layout(strings: int, categories: int, products: int) -> dict:
+    """
+    Расположение секций в файле.
+
+    Возвращает словарь {имя секции: (смещение, число элементов, тип)}
+    и отдельный ключ "strings" со смещением таблицы строк.
+    """
+    offset = HEADER.size
+    result = {}
+    for name, typecode, count in SECTIONS:
+        size = count(strings, categories, products)
+        result[name] = (offset, size, typecode)
+        offset += size * array(typecode).itemsize
+    result["strings"] = (offset, None, None)
+    return result
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def save_snapshot(categories: list[Category], file_path):
+    """
+    Сохраняет категории и их товары в двоичный снимок.
+
+    Поддерживаются товары зарегистрированных типов (Product, Smartphone,
+    LawnGrass и др.) с дополнительными полями из field_checks.
+    """
+    strings: dict[str, int] = {}
+
+    def string_id(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    # {класс товара: (индекс строки типа, дополнительные поля)}
+    types: dict[type, tuple[int, tuple[str, ...]]] = {}
+
+    def product_type(cls: type) -> tuple[int, tuple[str, ...]]:
+        extra_fields = _record_schema(cls).extra_fields
+        if extra_fields is None:
+            raise ValueError(
+                f"Снимок не поддерживает {cls.__name__}: не заданы field_checks"
+            )
+        types[cls] = (string_id(product_type_name(cls)), extra_fields)
+        return types[cls]
+
+    columns = {name: array(typecode) for name, typecode, _ in SECTIONS}
+    columns["category_starts"].append(0)
+    for category in categories:
+        columns["category_names"].append(string_id(category.name))
+        columns["category_descriptions"].append(string_id(category.description))
+        for product in category:
+            cls = type(product)
+            type_id, extra_fields = types.get(cls) or product_type(cls)
+            extras = ""
+            if extra_fields:
+                extras = json.dumps(
+                    {field: getattr(product, field) for field in extra_fields},
+                    ensure_ascii=False,
+                )
+            columns["product_names"].append(string_id(product.name))
+            columns["product_descriptions"].append(string_id(product.description))
+            columns["prices"].append(product.price)
+            columns["quantities"].append(product.quantity)
+            columns["product_types"].append(type_id)
+            columns["product_extras"].append(string_id(extras))
+        columns["category_starts"].append(len(columns["prices"]))
+
+    blob = bytearray()
+    offsets = columns["string_offsets"]
+    for text in strings:
+        offsets.append(len(blob))
+        blob += text.encode("utf-8")
+    offsets.append(len(blob))
+
+    body = [_to_bytes(columns[name]) for name, _, _ in SECTIONS]
+    body.append(bytes(blob))
+    checksum = 0
+    for chunk in body:
+        checksum = zlib.crc32(chunk, checksum)
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(strings),
+        len(columns["category_names"]),
+        len(columns["prices"]),
+        checksum,
+        0,
+    )
+    with open(file_path, "wb") as file:
+        file.write(header)
+        for chunk in body:
+            file.write(chunk)
+
+
+def read_header(buffer) -> tuple[int, int, int, int]:
+    """Проверяет заголовок, возвращает (строк, категорий, товаров, CRC32)"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("Некорректный файл снимка: нет заголовка")
+    magic, version, _, strings, categories, products, checksum, _ = (
+        HEADER.unpack_from(buffer)
+    )
+    if magic != MAGIC:
+        raise ValueError("Некорректный файл снимка: неизвестный формат")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+    return strings, categories, products, checksum
+
+
+def read_sections(buffer, verify: bool = True) -> dict:
+    """
+    Разбирает снимок без копирования данных.
+
+    Возвращает словарь {имя секции: memoryview нужного типа} и ключ
+    "strings" - memoryview таблицы строк.
+    """
+    strings, categories, products, checksum = read_header(buffer)
+    view = memoryview(buffer)
+    if verify and zlib.crc32(view[HEADER.size :]) != checksum:
+        raise ValueError("Некорректный файл снимка: не совпадает контрольная сумма")
+
+    sections = {}
+    for name, (offset, count, typecode) in layout(
+        strings, categories, products
+    ).items():
+        if typecode is None:
+            sections[name] = view[offset:]
+            continue
+        size = count * array(typecode).itemsize
+        if offset + size > len(view):
+            raise ValueError("Некорректный файл снимка: файл обрезан")
+        section = view[offset : offset + size]
+        if sys.byteorder == "big":
+            swapped = array(typecode, section.tobytes())
+            swapped.byteswap()
+            section = memoryview(swapped)
+        sections[name] = section.cast(typecode)
+    return sections
+
+
+def product_record(
+    type_name: str, extras: str, name: str, description: str, price, quantity
+) -> dict:
+    """Запись товара в формате data/products.json по полям снимка"""
+    record = {
+        "type": type_name,
+        "name": name,
+        "description": description,
+        "price": price,
+        "quantity": quantity,
+    }
+    if extras:
+        record.update(json.loads(extras))
+    return record
+
+
+def load_snapshot(file_path, verify: bool = True) -> list[Category]:
+    """
+    Загружает категории из двоичного снимка.
+
+    Строки декодируются один раз на уникальное значение, товары создаются
+    пакетно через Product.from_columns, а если в снимке есть наследники -
+    через Product.from_records.
+    """
+    with open(file_path, "rb") as file:
+        buffer = file.read()
+    sections = read_sections(buffer, verify)
+
+    blob = bytes(sections["strings"])
+    offsets = sections["string_offsets"].tolist()
+    strings = [
+        blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+        for i in range(len(offsets) - 1)
+    ]
+
+    columns = (
+        [strings[i] for i in sections["product_names"]],
+        [strings[i] for i in sections["product_descriptions"]],
+        sections["prices"].tolist(),
+        sections["quantities"].tolist(),
+    )
+    type_ids = sections["product_types"].tolist()
+    if all(strings[i] == "product" for i in set(type_ids)):
+        products = Product.from_columns(*columns)
+    else:
+        extras = sections["product_extras"].tolist()
+        products = Product.from_records(
+            product_record(strings[type_id], strings[extra], *values)
+            for type_id, extra, *values in zip(type_ids, extras, *columns)
+        )
+    starts = sections["category_starts"].tolist()
+    return [
+        Category.restore(strings[name], strings[description], products[start:stop])
+        for name, description, start, stop in zip(
+            sections["category_names"],
+            sections["category_descriptions"],
+            starts,
+            starts[1:],
+        )
+    ]
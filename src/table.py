@@ -0,0 +1,220 @@
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.category import Category
+from src.product import Product
+
+
+class ProductTable:
+    """
+    Каталог в колоночном виде на массивах NumPy.
+
+    Вместо миллионов объектов Product хранятся столбцы name, description,
+    price, quantity и category_id. Агрегаты считаются векторно, а объекты
+    Product создаются только по запросу.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        descriptions: Iterable[str],
+        prices: Iterable[float],
+        quantities: Iterable[int],
+        category_ids: Iterable[int] | None = None,
+        categories: list[tuple[str, str]] | None = None,
+    ):
+        self.names = np.asarray(list(names), dtype=object)
+        self.descriptions = np.asarray(list(descriptions), dtype=object)
+        self.prices = np.asarray(list(prices))
+        self.quantities = np.asarray(list(quantities))
+        if category_ids is None:
+            category_ids = np.zeros(len(self.names), dtype=np.int32)
+        self.category_ids = np.asarray(category_ids, dtype=np.int32)
+        # Список (название, описание) категорий, индекс - это category_id
+        self.categories = list(categories) if categories is not None else []
+
+        self._validate()
+        self.prices = self.prices.astype(np.float64, copy=False)
+        self.quantities = self.quantities.astype(np.int64, copy=False)
+
+    def _validate(self):
+        """Проверка столбцов целиком, с теми же правилами, что и в Product"""
+        size = len(self.names)
+        if not (
+            len(self.descriptions)
+            == len(self.prices)
+            == len(self.quantities)
+            == len(self.category_ids)
+            == size
+        ):
+            raise ValueError("Столбцы таблицы должны быть одинаковой длины")
+        if not all(isinstance(name, str) and name for name in self.names):
+            raise ValueError("Название должно быть непустой строкой")
+        if not all(isinstance(text, str) and text for text in self.descriptions):
+            raise ValueError("Описание должно быть непустой строкой")
+        if size and (
+            self.prices.dtype.kind not in "iuf" or (self.prices <= 0).any()
+        ):
+            raise ValueError("Цена не должна быть нулевая или отрицательная")
+        if size and (
+            self.quantities.dtype.kind not in "iu" or (self.quantities < 0).any()
+        ):
+            raise ValueError("Количество должно быть положительным целым числом")
+        if (
+            size
+            and self.categories
+            and self.category_ids.max() >= len(self.categories)
+        ):
+            raise ValueError("Некорректный идентификатор категории")
+
+    @classmethod
+    def from_products(
+        cls, products: Iterable[Product], category_id: int = 0
+    ) -> "ProductTable":
+        """Таблица из списка объектов Product"""
+        products = list(products)
+        return cls(
+            [p.name for p in products],
+            [p.description for p in products],
+            [p.price for p in products],
+            [p.quantity for p in products],
+            np.full(len(products), category_id, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_categories(cls, categories: Iterable[Category]) -> "ProductTable":
+        """Таблица из объектов Category, category_id - порядковый номер категории"""
+        names, descriptions, prices, quantities, category_ids = [], [], [], [], []
+        category_info = []
+        for category_id, category in enumerate(categories):
+            category_info.append((category.name, category.description))
+            for product in category:
+                names.append(product.name)
+                descriptions.append(product.description)
+                prices.append(product.price)
+                quantities.append(product.quantity)
+                category_ids.append(category_id)
+        return cls(names, descriptions, prices, quantities, category_ids, category_info)
+
+    @classmethod
+    def from_json(cls, file_path) -> "ProductTable":
+        """
+        Таблица напрямую из JSON файла формата data/products.json.
+
+        Объекты Product и Category при этом не создаются.
+        """
+        from src.utils import _iter_category_records
+
+        names, descriptions, prices, quantities, category_ids = [], [], [], [], []
+        category_info = []
+        for category_id, (name, description, products_data) in enumerate(
+            _iter_category_records(file_path)
+        ):
+            category_info.append((name, description))
+            for product_data in products_data:
+                names.append(product_data["name"])
+                descriptions.append(product_data["description"])
+                prices.append(product_data["price"])
+                quantities.append(product_data["quantity"])
+                category_ids.append(category_id)
+        return cls(names, descriptions, prices, quantities, category_ids, category_info)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _mask(self, category_id: int | None):
+        if category_id is None:
+            return slice(None)
+        return self.category_ids == category_id
+
+    def middle_price(self, category_id: int | None = None) -> float:
+        """Средняя цена, как Category.middle_price; 0 для пустой выборки"""
+        prices = self.prices[self._mask(category_id)]
+        if len(prices) == 0:
+            return 0
+        return float(prices.mean())
+
+    def calculate_total(self, category_id: int | None = None) -> int:
+        """Суммарное количество товаров, как Category.calculate_total"""
+        return int(self.quantities[self._mask(category_id)].sum())
+
+    def stock_value(self, category_id: int | None = None) -> float:
+        """Стоимость остатков quantity * price, как в Product.__add__"""
+        mask = self._mask(category_id)
+        return float(np.dot(self.quantities[mask], self.prices[mask]))
+
+    def middle_prices(self) -> np.ndarray:
+        """Средняя цена по каждой категории одним проходом"""
+        minlength = len(self.categories)
+        counts = np.bincount(self.category_ids, minlength=minlength)
+        sums = np.bincount(self.category_ids, weights=self.prices, minlength=minlength)
+        return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+    def filter(self, mask) -> "ProductTable":
+        """
+        Новая таблица из строк, удовлетворяющих условию.
+
+        mask - булев массив длины таблицы или функция, которая получает
+        таблицу и возвращает такой массив.
+        """
+        if callable(mask):
+            mask = mask(self)
+        mask = np.asarray(mask, dtype=bool)
+        table = ProductTable.__new__(ProductTable)
+        table.names = self.names[mask]
+        table.descriptions = self.descriptions[mask]
+        table.prices = self.prices[mask]
+        table.quantities = self.quantities[mask]
+        table.category_ids = self.category_ids[mask]
+        table.categories = self.categories
+        return table
+
+    def where(
+        self,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_quantity: int | None = None,
+        max_quantity: int | None = None,
+        category_id: int | None = None,
+    ) -> "ProductTable":
+        """Фильтр по диапазонам цены и количества (границы включаются)"""
+        mask = np.ones(len(self), dtype=bool)
+        if min_price is not None:
+            mask &= self.prices >= min_price
+        if max_price is not None:
+            mask &= self.prices <= max_price
+        if min_quantity is not None:
+            mask &= self.quantities >= min_quantity
+        if max_quantity is not None:
+            mask &= self.quantities <= max_quantity
+        if category_id is not None:
+            mask &= self.category_ids == category_id
+        return self.filter(mask)
+
+    def product(self, index: int) -> Product:
+        """Объект Product для строки таблицы, создаётся при обращении"""
+        return Product(
+            self.names[index],
+            self.descriptions[index],
+            float(self.prices[index]),
+            int(self.quantities[index]),
+        )
+
+    def __getitem__(self, index: int) -> Product:
+        if not -len(self) <= index < len(self):
+            raise IndexError("Индекс за пределами таблицы")
+        return self.product(index)
+
+    def __iter__(self) -> Iterator[Product]:
+        for index in range(len(self)):
+            yield self.product(index)
+
+    def to_categories(self) -> list[Category]:
+        """Обратное преобразование в объекты Category"""
+        result = []
+        for category_id, (name, description) in enumerate(self.categories):
+            indexes = np.flatnonzero(self.category_ids == category_id)
+            products = [self.product(i) for i in indexes]
+            result.append(Category.restore(name, description, products))
+        return result
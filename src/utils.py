@@ -1,10 +1,305 @@
+import glob
+import hashlib
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator
 
-from src.category import Category
-from src.product import Product
+from src.category import Category, ZeroQuantity
+from src.metrics import get_metrics
+from src.product import (PRICE_POLICY_APPROVE, PRODUCT_TYPE_FIELD, Product,
+                         _require_fields, product_class)
 
+# Размер порции чтения файла при потоковом разборе JSON
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
-def load_data_from_json(file_path) -> list[str]:
+
+class _JsonStreamReader:
+    """
+    Потоковый читатель JSON-файла каталога.
+
+    Файл читается порциями по chunk_size символов, в памяти держится только
+    ещё не разобранный хвост буфера. Отдельные значения (строки, числа,
+    объекты товаров) разбираются стандартным json.JSONDecoder.raw_decode.
+    """
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int | None = None) -> bool:
+        """Дочитывает очередную порцию файла, отбрасывая уже разобранное"""
+        if self._eof:
+            return False
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Возвращает следующий значимый символ, пропуская пробелы"""
+        while True:
+            while self._pos < len(self._buffer):
+                char = self._buffer[self._pos]
+                if char not in self._WHITESPACE:
+                    return char
+                self._pos += 1
+            if not self._fill():
+                raise ValueError("Неожиданный конец JSON файла")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(
+                f"Некорректный JSON: ожидался '{char}' в позиции {self._pos}"
+            )
+        self._pos += 1
+
+    def decode_value(self):
+        """Разбирает одно JSON-значение, при необходимости дочитывая файл"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Число или литерал на границе буфера могут быть неполными
+            if end >= len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def decode_raw(self) -> tuple[object, str]:
+        """
+        Разбирает одно JSON-значение целиком, возвращает (значение, исходный текст).
+
+        Значение разбирается одним вызовом raw_decode, порции чтения при
+        этом удваиваются, чтобы большой массив не разбирался заново много раз.
+        """
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            if end >= len(self._buffer) and self._fill():
+                continue
+            text = self._buffer[self._pos : end]
+            self._pos = end
+            return value, text
+
+    def iter_array(self) -> Iterator:
+        """Перебирает элементы JSON-массива по одному"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.decode_value()
+            if self.peek() == ",":
+                self._pos += 1
+            else:
+                self.expect("]")
+                return
+
+
+def _iter_category_records(
+    file_path, chunk_size: int = DEFAULT_CHUNK_SIZE, content_hashes: bool = False
+):
+    """
+    Потоково разбирает файл формата data/products.json.
+
+    Возвращает генератор кортежей (name, description, products), где products -
+    список словарей с данными товаров одной категории. Одновременно в памяти
+    находится только одна категория.
+
+    При content_hashes=True в кортеж добавляется хеш содержимого категории
+    (описание и исходный текст списка товаров), а список товаров разбирается
+    целиком одним вызовом raw_decode.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        reader = _JsonStreamReader(file, chunk_size)
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        while True:
+            record = {}
+            products_text = ""
+            reader.expect("{")
+            if reader.peek() == "}":
+                reader.expect("}")
+            else:
+                while True:
+                    key = reader.decode_value()
+                    reader.expect(":")
+                    if key == "products" and content_hashes:
+                        record[key], products_text = reader.decode_raw()
+                    elif key == "products":
+                        record[key] = list(reader.iter_array())
+                    else:
+                        record[key] = reader.decode_value()
+                    if reader.peek() == ",":
+                        reader.expect(",")
+                    else:
+                        reader.expect("}")
+                        break
+            if content_hashes:
+                yield (
+                    record["name"],
+                    record["description"],
+                    record["products"],
+                    _content_hash(record["description"], products_text),
+                )
+            else:
+                yield record["name"], record["description"], record["products"]
+
+            if reader.peek() == ",":
+                reader.expect(",")
+            else:
+                reader.expect("]")
+                return
+
+
+def _content_hash(description: str, products_text: str) -> str:
+    """Хеш содержимого категории в файле: описание и исходный текст товаров"""
+    content = hashlib.blake2b(description.encode("utf-8"), digest_size=16)
+    content.update(b"\0")
+    content.update(products_text.encode("utf-8"))
+    return content.hexdigest()
+
+
+def _build_products(products_data: list[dict]) -> list[Product]:
+    return Product.from_records(products_data)
+
+
+def iter_categories_from_json(
+    file_path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Category]:
+    """
+    Потоковая загрузка каталога из JSON файла.
+
+    Параметры:
+    file_path (str): путь к JSON файлу с данными.
+    chunk_size (int): размер порции чтения файла в символах.
+
+    Возвращает:
+    Iterator[Category]: генератор готовых объектов Category. Файл не загружается
+    в память целиком, поэтому расход памяти не зависит от размера файла.
+    """
+    for name, description, products_data in _iter_category_records(
+        file_path, chunk_size
+    ):
+        yield Category(name, description, _build_products(products_data))
+
+
+def iter_categories_from_jsonl(file_path) -> Iterator[Category]:
+    """
+    Потоковая загрузка каталога из JSONL файла (см. src.generator).
+
+    Каждая строка - запись товара с дополнительными полями category и
+    category_description. Подряд идущие товары одной категории собираются
+    в один объект Category, в памяти держится только текущая категория.
+    """
+    with open(file_path, encoding="utf-8") as file:
+        records = map(json.loads, filter(str.strip, file))
+        for name, group in groupby(records, key=itemgetter("category")):
+            products_data = list(group)
+            description = products_data[0]["category_description"]
+            for record in products_data:
+                del record["category"], record["category_description"]
+            yield Category(name, description, _build_products(products_data))
+
+
+def _occurrence_keys(names: Iterable[str]) -> Iterator[tuple[str, int]]:
+    """Ключи (название, номер вхождения) для сопоставления повторяющихся названий"""
+    seen: dict[str, int] = {}
+    for name in names:
+        occurrence = seen.get(name, 0)
+        seen[name] = occurrence + 1
+        yield name, occurrence
+
+
+class Catalog:
+    """
+    Результат загрузки каталога.
+
+    Хранит созданные категории и словари для поиска за O(1):
+    categories_by_name - категория по названию, products_by_name - товар по
+    названию. При повторяющихся названиях в словаре остаётся первое вхождение.
+    hashes - хеши содержимого категорий в исходном файле (None - неизвестен),
+    по ним reload_catalog пропускает неизменённые категории.
+    """
+
+    def __init__(self, categories: Iterable[Category] = ()):
+        self.categories: list[Category] = []
+        self.hashes: list[str | None] = []
+        self.categories_by_name: dict[str, Category] = {}
+        self.products_by_name: dict[str, Product] = {}
+        # Число товаров с каждым названием, нужно при удалении товаров
+        self._name_counts: dict[str, int] = {}
+        for category in categories:
+            self.add_category(category)
+
+    def add_category(self, category: Category, content_hash: str | None = None):
+        """Добавляет категорию и её товары в словари поиска"""
+        self.categories.append(category)
+        self.hashes.append(content_hash)
+        self.categories_by_name.setdefault(category.name, category)
+        self._add_products(category)
+
+    def _add_products(self, products: Iterable[Product]):
+        for product in products:
+            self.products_by_name.setdefault(product.name, product)
+            self._name_counts[product.name] = self._name_counts.get(product.name, 0) + 1
+
+    def _remove_products(self, products: Iterable[Product]) -> set[str]:
+        """Убирает товары из словарей, возвращает названия для повторного поиска"""
+        stale = set()
+        for product in products:
+            name = product.name
+            self._name_counts[name] -= 1
+            if not self._name_counts[name]:
+                del self._name_counts[name]
+            if self.products_by_name.get(name) is product:
+                del self.products_by_name[name]
+                if name in self._name_counts:
+                    stale.add(name)
+        return stale
+
+    @property
+    def names(self) -> list[str]:
+        return [category.name for category in self.categories]
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(self.categories)
+
+    def __getitem__(self, name: str) -> Category:
+        return self.categories_by_name[name]
+
+    def product(self, name: str) -> Product:
+        """Товар по названию, KeyError - если такого нет"""
+        return self.products_by_name[name]
+
+
+def load_data_from_json(file_path) -> Catalog:
     """
     Функция для загрузки данных из JSON файла и создания объектов классов Category и Product.
 
@@ -12,25 +307,280 @@ def load_data_from_json(file_path) -> list[str]:
     file_path (str): путь к JSON файлу с данными.
 
     Возвращает:
-    list[Category]: список объектов класса Category, созданных на основе данных из файла.
+    Catalog: созданные категории и словари для поиска категорий и товаров
+    по названию. Файл разбирается один раз.
     """
-    categories = []
-    with open(file_path, "r", encoding="utf-8") as file:
-        data = json.load(file)
-
-    for category_data in data:
-        name = category_data["name"]
-        description = category_data["description"]
-        products = [
-            Product(
-                product_data["name"],
-                product_data["description"],
-                product_data["price"],
-                product_data["quantity"],
+    metrics = get_metrics()
+    catalog = Catalog()
+    with metrics.timer("json_load_seconds", phase="total"):
+        records = metrics.timed(
+            _iter_category_records(file_path, content_hashes=True),
+            "json_load_seconds",
+            phase="parse",
+        )
+        for name, description, products_data, content_hash in records:
+            with metrics.timer("json_load_seconds", phase="products"):
+                products = _build_products(products_data)
+            with metrics.timer("json_load_seconds", phase="category"):
+                category = Category(name, description, products)
+                catalog.add_category(category, content_hash)
+    metrics.inc("json_load_categories_total", len(catalog))
+    return catalog
+
+
+def _check_quantities(products: list[Product]):
+    """ZeroQuantity, если хотя бы один товар нельзя добавить в категорию"""
+    for product in products:
+        if product.quantity == 0:
+            raise ZeroQuantity(
+                "Товар с нулевым количеством не может быть добавлен: "
+                f"{product.name}"
             )
-            for product_data in category_data["products"]
-        ]
-        category = Category(name, description, products)
-        categories.append(category.name)
 
-    return categories
+
+def _plan_category_update(category: Category, products_data: list[dict]) -> dict:
+    """
+    Сопоставляет товары категории с данными файла, ничего не меняя.
+
+    Все записи проверяются здесь, включая нулевое количество новых товаров,
+    поэтому ошибка в данных не оставляет категорию изменённой наполовину.
+    """
+    for record in products_data:
+        _require_fields(record, ("name", "description", "price", "quantity"))
+    current = category[:]
+    existing = dict(zip(_occurrence_keys(p.name for p in current), current))
+    updates, new_records = [], []
+    # Товары, у которых сменился тип или дополнительные поля, создаются заново
+    replaced, replacement_records, changed = [], [], []
+    for key, record in zip(
+        _occurrence_keys(record["name"] for record in products_data), products_data
+    ):
+        product = existing.pop(key, None)
+        if product is None:
+            new_records.append(record)
+            continue
+        target = product_class(record.get(PRODUCT_TYPE_FIELD, "product"))
+        _require_fields(record, (spec[0] for spec in target.field_checks))
+        if type(product) is not target or any(
+            getattr(product, spec[0]) != record[spec[0]] for spec in target.field_checks
+        ):
+            replaced.append(product)
+            replacement_records.append(record)
+            changed.append(record["name"])
+            continue
+        name, description = record["name"], record["description"]
+        price, quantity = record["price"], record["quantity"]
+        Product._validate(name, description, price, quantity)
+        if (product.description, product.price, product.quantity) != (
+            description,
+            price,
+            quantity,
+        ):
+            updates.append((product, description, price, quantity))
+            changed.append(name)
+
+    added = []
+    if new_records or replacement_records:
+        added = _build_products(new_records + replacement_records)
+        _check_quantities(added)
+    return {
+        "updates": updates,
+        "removed": list(existing.values()),
+        "replaced": replaced,
+        "added": added,
+        "new": len(new_records),
+        "changed": changed,
+    }
+
+
+def _update_category(
+    catalog: Catalog, category: Category, description: str, plan: dict
+) -> tuple[dict[str, list[str]], set[str]]:
+    """
+    Применяет к категории проверенные в _plan_category_update отличия.
+
+    Возвращает изменения по видам и названия товаров, которые нужно заново
+    найти для products_by_name.
+    """
+    if category.description != description:
+        category.description = description
+    for product, description, price, quantity in plan["updates"]:
+        product.description = description
+        if product.price != price:
+            product.set_price(float(price), PRICE_POLICY_APPROVE)
+        if product.quantity != quantity:
+            product.quantity = quantity
+
+    removed = plan["removed"] + plan["replaced"]
+    if removed:
+        category.remove_products(removed)
+    added = plan["added"]
+    for product in added:
+        category.add_product(product)
+    changes = {
+        "added": [product.name for product in added[: plan["new"]]],
+        "removed": [product.name for product in plan["removed"]],
+        "changed": plan["changed"],
+    }
+
+    stale = catalog._remove_products(removed)
+    catalog._add_products(added)
+    return changes, stale
+
+
+def reload_catalog(catalog: Catalog, file_path) -> dict[str, list]:
+    """
+    Инкрементальная перезагрузка каталога из изменённого JSON файла.
+
+    Файл разбирается потоково, для каждой категории считается хеш содержимого.
+    Категории с прежним хешем пропускаются без создания объектов, в остальных
+    товары сопоставляются по названию: изменённые обновляются на месте,
+    новые добавляются, отсутствующие в файле удаляются. Категории, которых
+    больше нет в файле, удаляются через Category.discard, поэтому счётчики
+    Category.total_categories и Category.total_products остаются верными.
+    Понижение цены из файла применяется без подтверждения. Файл сначала
+    целиком проверяется, поэтому при ошибке в данных (например, новый
+    товар с нулевым количеством - ZeroQuantity) каталог не меняется.
+
+    Возвращает словарь с ключами "categories_added", "categories_removed"
+    (названия категорий) и "added", "removed", "changed" - списки пар
+    (название категории, название товара).
+    """
+    result = {
+        "categories_added": [],
+        "categories_removed": [],
+        "added": [],
+        "removed": [],
+        "changed": [],
+    }
+    positions = dict(zip(_occurrence_keys(catalog.names), range(len(catalog))))
+    hashes: list[str | None] = []
+    stale: set[str] = set()
+
+    # Сначала весь файл разбирается и проверяется, каталог не меняется:
+    # ошибка в любой категории оставляет его в прежнем состоянии
+    plans = []
+    occurrences: dict[str, int] = {}
+    for name, description, products_data, content_hash in _iter_category_records(
+        file_path, content_hashes=True
+    ):
+        key = (name, occurrences.get(name, 0))
+        occurrences[name] = key[1] + 1
+        position = positions.pop(key, None)
+        if position is None:
+            products = _build_products(products_data)
+            _check_quantities(products)
+            plans.append((name, description, None, products))
+        else:
+            category = catalog.categories[position]
+            plan = None
+            if catalog.hashes[position] != content_hash:
+                plan = _plan_category_update(category, products_data)
+            plans.append((name, description, category, plan))
+        hashes.append(content_hash)
+
+    categories: list[Category] = []
+    for name, description, category, plan in plans:
+        if category is None:
+            # Для новой категории plan - её проверенные товары
+            category = Category(name, description, plan)
+            products = plan
+            catalog._add_products(products)
+            result["categories_added"].append(name)
+        elif plan is not None:
+            changes, names_to_find = _update_category(
+                catalog, category, description, plan
+            )
+            stale |= names_to_find
+            for kind, product_names in changes.items():
+                result[kind].extend((name, product) for product in product_names)
+        categories.append(category)
+
+    for position in sorted(positions.values()):
+        category = catalog.categories[position]
+        stale |= catalog._remove_products(category[:])
+        category.discard()
+        result["categories_removed"].append(category.name)
+
+    catalog.categories = categories
+    catalog.hashes = hashes
+    catalog.categories_by_name = {}
+    for category in categories:
+        catalog.categories_by_name.setdefault(category.name, category)
+    if stale:
+        # Удалено первое вхождение повторяющегося названия - ищем следующее
+        for category in categories:
+            for product in category:
+                if product.name in stale:
+                    catalog.products_by_name.setdefault(product.name, product)
+    return result
+
+
+def _load_shard(file_path) -> list[tuple[str, str, list[Product]]]:
+    """
+    Разбор и валидация одного файла-шарда в дочернем процессе.
+
+    Товары с нулевым количеством отклоняют весь шард до объединения,
+    чтобы в категории не попала только его часть.
+    """
+    shard = []
+    for name, description, products_data in _iter_category_records(file_path):
+        products = _build_products(products_data)
+        _check_quantities(products)
+        shard.append((name, description, products))
+    return shard
+
+
+def _resolve_shards(sources: str | Iterable[str]) -> list[str]:
+    if isinstance(sources, str):
+        if glob.has_magic(sources):
+            return sorted(glob.glob(sources))
+        return [sources]
+    return [str(source) for source in sources]
+
+
+def load_data_from_files(
+    sources: str | Iterable[str], max_workers: int | None = None
+) -> tuple[list[Category], dict[str, str]]:
+    """
+    Параллельная загрузка каталога из нескольких JSON файлов (шардов).
+
+    Шарды разбираются и валидируются в пуле процессов, а объекты Category
+    собираются в родительском процессе, поэтому счётчики
+    Category.total_categories и Category.total_products остаются верными.
+    Категории с одинаковым названием из разных шардов объединяются.
+
+    Параметры:
+    sources (str | list[str]): список путей к файлам или шаблон glob.
+    max_workers (int | None): число процессов, по умолчанию - число ядер.
+
+    Возвращает:
+    tuple[list[Category], dict[str, str]]: список категорий и словарь ошибок
+    вида {путь к шарду: описание ошибки}. Ошибка в одном шарде не прерывает
+    загрузку остальных.
+    """
+    paths = _resolve_shards(sources)
+    categories: dict[str, Category] = {}
+    errors: dict[str, str] = {}
+    if not paths:
+        return [], errors
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_load_shard, path) for path in paths]
+        # Результаты объединяются в порядке шардов, а не завершения
+        for path, future in zip(paths, futures):
+            try:
+                shard = future.result()
+            except Exception as e:
+                errors[path] = f"{type(e).__name__}: {e}"
+                continue
+            # Шард целиком проверен в _load_shard, объединение не прерывается
+            for name, description, products in shard:
+                category = categories.get(name)
+                if category is None:
+                    categories[name] = Category(name, description, products)
+                else:
+                    for product in products:
+                        category.add_product(product)
+
+    return list(categories.values()), errors
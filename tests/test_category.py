@@ -1,10 +1,14 @@
+import copy
+import pickle
+import threading
 from io import StringIO
 from unittest.mock import patch
 
 import pytest
 
-from src.category import Category, CategoryIterator, Order, ZeroQuantity
-from src.product import Product
+from src.category import (Category, CategoryIterator, Order, ZeroQuantity,
+                          _SortedIndex, place_orders, reprice)
+from src.product import Product, _stock_lock
 
 
 def test_category_init():
@@ -265,3 +269,516 @@ def test_display_info_formatting():
 
     # Assert
     assert "Часы × 5 = 750.00 ₽" in info
+
+
+def test_aggregates_follow_product_changes(monkeypatch):
+    # Включаем сверку накопленных сумм с полным пересчётом
+    monkeypatch.setattr(Category, "check_aggregates", True)
+    product1 = Product("Смартфон", "Современный смартфон с большим экраном", 1000.0, 10)
+    product2 = Product("Ноутбук", "Мощный ноутбук для работы", 5000.0, 5)
+    category = Category("Электроника", "Электронные устройства", [product1, product2])
+
+    product1.quantity = 4
+    product2.price = 7000.0
+    Order(product2, 2)
+    with patch("builtins.input", return_value="y"):
+        product1.price = 500.0
+
+    assert category.calculate_total() == 7
+    assert category.middle_price() == 3750.0
+    assert str(category) == "Электроника, количество продуктов: 7"
+    assert category.display_info == "Электроника, количество продуктов: 7"
+
+
+def test_aggregates_shared_product(monkeypatch):
+    monkeypatch.setattr(Category, "check_aggregates", True)
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 10)
+    category1 = Category("Электроника", "Электронные устройства", [product])
+    category2 = Category("Смартфоны", "Категория смартфонов", [product])
+
+    # Изменение товара видно во всех категориях, где он есть
+    product.quantity = 3
+    assert category1.calculate_total() == category2.calculate_total() == 3
+
+
+def test_verify_aggregates_detects_drift():
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 10)
+    category = Category("Электроника", "Электронные устройства", [product])
+    category._Category__quantity_total = 11
+
+    with pytest.raises(RuntimeError):
+        category.verify_aggregates()
+
+
+def test_reprice():
+    product1 = Product("Смартфон", "Современный смартфон с большим экраном", 1000.0, 10)
+    product2 = Product("Ноутбук", "Мощный ноутбук для работы", 5000.0, 5)
+    product3 = Product("Планшет", "Стильный", 3000.0, 5)
+    category = Category("Электроника", "Электронные устройства", [product1, product2])
+
+    with patch("builtins.input", side_effect=AssertionError):
+        summary = reprice(category, {"Смартфон": 900.0, "Ноутбук": -1})
+    assert summary == {
+        "applied": [("Смартфон", 1000.0, 900.0)],
+        "rejected": [],
+        "invalid": [("Ноутбук", 5000.0, -1)],
+    }
+    assert category.middle_price() == 2950.0
+
+    # Функция вместо словаря и запрет понижения
+    summary = reprice(
+        [product2, product3], lambda product: product.price * 0.5, policy="reject"
+    )
+    assert [change[0] for change in summary["rejected"]] == ["Ноутбук", "Планшет"]
+    assert product2.price == 5000.0
+
+
+def test_streaming_rendering():
+    products = [
+        Product(f"Товар {i}", "Описание", 100.0 + i, i + 1) for i in range(5)
+    ]
+    category = Category("Электроника", "Электронные устройства", products)
+
+    assert "".join(category.iter_products()) == category.products
+    assert "".join(category.iter_product_info()) == category.get_product_info
+    assert list(category.iter_products(offset=3)) == [
+        "Товар 3, 103.0 руб. Остаток: 4\n",
+        "Товар 4, 104.0 руб. Остаток: 5\n",
+    ]
+    assert list(category.iter_product_info(offset=1, limit=1)) == [
+        "Товар 1, 101.0 руб. Остаток: 2 шт.\n"
+    ]
+    assert list(category.iter_products(offset=10, limit=2)) == []
+
+    stream = StringIO()
+    category.write_product_info(stream, offset=4)
+    assert stream.getvalue() == "Товар 4, 104.0 руб. Остаток: 5 шт.\n"
+    stream = StringIO()
+    category.write_products(stream, limit=2)
+    assert stream.getvalue() == f"{products[0]}\n{products[1]}\n"
+
+    with pytest.raises(ValueError):
+        list(category.iter_products(offset=-1))
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_range_and_top_queries(indexed):
+    products = [
+        Product("Смартфон", "Описание", 30000.0, 3),
+        Product("Ноутбук", "Описание", 60000.0, 10),
+        Product("Планшет", "Описание", 20000.0, 1),
+        Product("Часы", "Описание", 45000.0, 7),
+    ]
+    category = Category("Электроника", "Электронные устройства", products)
+    if indexed:
+        category.enable_indexes()
+    assert category.has_indexes == indexed
+
+    def names(result):
+        return [product.name for product in result]
+
+    assert names(category.products_in_price_range(20000, 50000)) == [
+        "Планшет",
+        "Смартфон",
+        "Часы",
+    ]
+    assert names(category.products_in_quantity_range(high=4)) == ["Планшет", "Смартфон"]
+    assert names(category.top_by_price(2)) == ["Ноутбук", "Часы"]
+    assert names(category.top_by_quantity(1, highest=False)) == ["Планшет"]
+
+    # Индексы следуют за изменениями цены, количества и составом категории
+    products[1].price = 70000.0
+    products[3].quantity = 0
+    with patch("builtins.input", return_value="y"):
+        products[0].price = 10000.0
+    category.add_product(Product("Наушники", "Описание", 25000.0, 2))
+
+    assert names(category.products_in_price_range(low=20000, high=30000)) == [
+        "Планшет",
+        "Наушники",
+    ]
+    assert names(category.products_in_quantity_range(high=1)) == ["Часы", "Планшет"]
+    assert names(category.top_by_price(1)) == ["Ноутбук"]
+    assert names(category.top_by_price(2, highest=False)) == ["Смартфон", "Планшет"]
+
+
+def test_sorted_index_blocks(monkeypatch):
+    # Маленькие блоки, чтобы проверить их деление и удаление
+    monkeypatch.setattr(_SortedIndex, "_LOAD", 2)
+    products = [
+        Product(f"Товар {i}", "Описание", 100.0 + i, i % 3 + 1) for i in range(9)
+    ]
+    category = Category("Электроника", "Электронные устройства", products[:3])
+    category.enable_indexes()
+    for product in products[3:]:
+        category.add_product(product)
+    for product in products[:6]:
+        product.price = product.price + 1000.0
+
+    prices = [p.price for p in category.products_in_price_range()]
+    assert prices == sorted(p.price for p in products)
+    assert [p.price for p in category.products_in_price_range(106.0, 1102.0)] == [
+        106.0,
+        107.0,
+        108.0,
+        1100.0,
+        1101.0,
+        1102.0,
+    ]
+    assert [p.quantity for p in category.top_by_quantity(4)] == [3, 3, 3, 2]
+    assert len(category.products_in_quantity_range(1, 1)) == 3
+
+
+def test_concurrent_orders_do_not_oversell():
+    product1 = Product("Смартфон", "Современный смартфон", 1000.0, 500)
+    product2 = Product("Ноутбук", "Мощный ноутбук", 5000.0, 300)
+    category = Category("Электроника", "Электронные устройства", [product1, product2])
+    total_categories = Category.total_categories
+    placed = []
+    rejected = []
+    barrier = threading.Barrier(16)
+
+    def worker(number):
+        barrier.wait()
+        for i in range(100):
+            product = product1 if (number + i) % 2 else product2
+            try:
+                Order(product, 1 + i % 3)
+                placed.append((product, 1 + i % 3))
+            except ValueError:
+                rejected.append(product)
+        Category(f"Категория {number}", "Описание", None)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sold1 = sum(quantity for product, quantity in placed if product is product1)
+    sold2 = sum(quantity for product, quantity in placed if product is product2)
+    assert product1.quantity == 500 - sold1 >= 0
+    assert product2.quantity == 300 - sold2 >= 0
+    assert rejected  # спрос больше остатка
+    assert category.calculate_total() == product1.quantity + product2.quantity
+    category.verify_aggregates()
+    assert Category.total_categories == total_categories + 16
+
+
+def test_reserve_and_restock():
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 5)
+    category = Category("Электроника", "Электронные устройства", [product])
+
+    product.reserve(5)
+    with pytest.raises(ValueError, match="Некорректное количество товара"):
+        product.reserve(1)
+    product.restock(2)
+    assert product.quantity == 2
+    assert category.calculate_total() == 2
+
+    order = Order(product, 1)
+    with pytest.raises(ValueError):
+        order.update_quantity(5)
+    order.update_quantity(2)
+    assert product.quantity == 0
+
+
+def test_place_orders_all_or_nothing():
+    product1 = Product("Смартфон", "Современный смартфон", 1000.0, 5)
+    product2 = Product("Ноутбук", "Мощный ноутбук", 5000.0, 2)
+    category = Category("Электроника", "Электронные устройства", [product1, product2])
+
+    batch = place_orders([(product1, 2), (product2, 1), (product1, 3)])
+
+    assert [(p.name, q, total) for p, q, total in batch.lines] == [
+        ("Смартфон", 2, 2000.0),
+        ("Ноутбук", 1, 5000.0),
+        ("Смартфон", 3, 3000.0),
+    ]
+    assert batch.calculate_total() == 10000.0
+    assert product1.quantity == 0
+    assert category.calculate_total() == 1
+    assert batch.display_info == (
+        "Пакет заказов: строк 3, отклонено 0, итого 10000.00 ₽"
+    )
+
+    # Не хватает одной строки - не списывается ничего
+    with pytest.raises(ValueError):
+        place_orders([(product2, 1), (product1, 1)])
+    assert product2.quantity == 1
+    with pytest.raises(ValueError):
+        place_orders([(product2, 0)])
+
+
+def test_place_orders_best_effort():
+    product1 = Product("Смартфон", "Современный смартфон", 1000.0, 5)
+    product2 = Product("Ноутбук", "Мощный ноутбук", 5000.0, 2)
+
+    batch = place_orders(
+        [(product1, 4), (product1, 2), (product2, 2), (product1, 1), (product2, -1)],
+        all_or_nothing=False,
+    )
+
+    assert [(p.name, q) for p, q, _ in batch.lines] == [
+        ("Смартфон", 4),
+        ("Ноутбук", 2),
+        ("Смартфон", 1),
+    ]
+    assert [(p.name, q) for p, q, _ in batch.rejected] == [
+        ("Ноутбук", -1),
+        ("Смартфон", 2),
+    ]
+    assert batch.calculate_total() == 15000.0
+    assert product1.quantity == 0
+    assert product2.quantity == 0
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_remove_products(indexed):
+    products = [
+        Product(f"Товар {i}", "Описание", 100.0 * (i + 1), i + 1) for i in range(4)
+    ]
+    category = Category("Склад", "Товары склада", products)
+    if indexed:
+        category.enable_indexes()
+    total_categories = Category.total_categories
+    total_products = Category.total_products
+
+    assert category.remove_products([products[1], products[3]]) == 2
+    assert category.remove_product(products[1]) is False
+
+    assert category.category_product_count == 2
+    assert category.calculate_total() == 4
+    assert category.middle_price() == 200.0
+    assert category.top_by_price(1)[0] is products[2]
+    category.verify_aggregates()
+    assert Category.total_products == total_products - 2
+    # Удалённый товар больше не влияет на категорию
+    products[3].quantity = 100
+    products[3].price = 1000.0
+    assert category.calculate_total() == 4
+
+    category.discard()
+    assert category.category_product_count == 0
+    assert Category.total_products == total_products - 4
+    assert Category.total_categories == total_categories - 1
+
+
+def test_order_multiple_lines():
+    product1 = Product("Смартфон", "Современный смартфон", 1000.0, 10)
+    product2 = Product("Ноутбук", "Мощный ноутбук", 5000.0, 3)
+    total_products = Category.total_products
+
+    order = Order()
+    order.add_product(product1, 2)
+    order.add_product(product2)
+    # Повторное добавление увеличивает существующую строку
+    order.add_product(product1, 3)
+
+    assert len(order) == 2
+    assert order.quantity == 6
+    assert order.calculate_total() == 10000.0
+    assert order.lines == [(product1, 5, 5000.0), (product2, 1, 5000.0)]
+    assert product1.quantity == 5
+    # Заказ не меняет счётчик товаров каталога
+    assert Category.total_products == total_products
+    assert repr(order) == "Заказ: строк 2, единиц 6, итого 10000.00 ₽"
+
+    # Стоимость строки зафиксирована по цене на момент добавления
+    product2.price = 6000.0
+    assert order.calculate_total() == 10000.0
+
+    order.update_quantity(2, product1)
+    assert order.calculate_total() == 7000.0
+    assert product1.quantity == 8
+    with pytest.raises(ValueError):
+        order.update_quantity(1)
+
+    assert order.remove_product(product1) is True
+    assert order.remove_product(product1) is False
+    assert product1 not in order
+    assert product1.quantity == 10
+    assert order.lines == [(product2, 1, 5000.0)]
+    assert order.display_info == "Заказ: Ноутбук × 1 = 5000.00 ₽"
+
+
+def test_order_add_products_all_or_nothing():
+    products = [Product(f"Товар {i}", "Описание", 10.0, 5) for i in range(100)]
+    order = Order()
+
+    order.add_products([(product, 1 + i % 3) for i, product in enumerate(products)])
+
+    assert len(order) == 100
+    assert order.calculate_total() == sum(10.0 * (1 + i % 3) for i in range(100))
+
+    # На последнюю строку не хватает остатка - заказ и склад не меняются
+    with pytest.raises(ValueError):
+        order.add_products([(products[0], 1), (products[1], 10)])
+    assert len(order) == 100
+    assert products[0].quantity == 4
+    assert products[1].quantity == 3
+
+
+def test_category_iteration_and_chunks():
+    products = [Product(f"Товар {i}", "Описание", 10.0 + i, 1) for i in range(7)]
+    category = Category("Склад", "Товары склада", products)
+
+    assert len(category) == 7
+    assert list(category) == products
+    assert category[0] is products[0]
+    assert category[2:4] == products[2:4]
+    assert [len(chunk) for chunk in category.iter_chunks(3)] == [3, 3, 1]
+    assert [p for chunk in category.iter_chunks(3) for p in chunk] == products
+    with pytest.raises(ValueError):
+        next(category.iter_chunks(0))
+
+    iterator = CategoryIterator(category)
+    assert next(iterator) is products[0]
+    assert list(iterator) == products[1:]
+    # Категория без списка товаров
+    empty = Category("Пустая", "Без товаров", None)
+    assert len(empty) == 0
+    assert list(CategoryIterator(empty)) == []
+    assert list(empty.iter_chunks(2)) == []
+
+
+def test_category_snapshot_iteration_during_add():
+    products = [Product(f"Товар {i}", "Описание", 10.0, 1) for i in range(3)]
+    category = Category("Склад", "Товары склада", products)
+    added = Product("Новый", "Описание", 10.0, 1)
+
+    # Обход копии не видит товары, добавленные во время обхода
+    seen = []
+    for product in category.iter_snapshot():
+        if not seen:
+            category.add_product(added)
+        seen.append(product)
+    assert seen == products
+
+    chunks = []
+    for chunk in category.iter_chunks(2, snapshot=True):
+        if not chunks:
+            category.add_product(Product("Ещё один", "Описание", 10.0, 1))
+        chunks.append(chunk)
+    assert chunks == [products[:2], [products[2], added]]
+
+    # Обычный обход включает добавленные во время обхода товары
+    last = Product("Последний", "Описание", 10.0, 1)
+    seen = []
+    for product in category:
+        if not seen:
+            category.add_product(last)
+        seen.append(product)
+    assert seen == category[:]
+    assert seen[-1] is last
+
+
+def test_product_copy_and_pickle_in_category():
+    product = Product("Телефон", "Смартфон", 1000.0, 5)
+    category = Category("Телефоны", "Категория", [product])
+    category.enable_indexes()
+
+    # Копия товара не подписана на категорию и не меняет её суммы
+    clone = copy.copy(product)
+    clone.quantity = 100
+    assert category.calculate_total() == 5
+    category.verify_aggregates()
+    assert pickle.loads(pickle.dumps(product)).quantity == 5
+
+    # Копия категории получает свою блокировку и свои подписки товаров
+    restored = pickle.loads(pickle.dumps(category))
+    restored[0].quantity = 7
+    assert restored.calculate_total() == 7
+    restored.verify_aggregates()
+    assert category.calculate_total() == 5
+    category.verify_aggregates()
+
+
+def test_price_change_concurrent_with_add_product():
+    products = [Product(f"Товар {i}", "Описание", 10.0, 1) for i in range(200)]
+    category = Category("Склад", "Товары склада", [])
+
+    def reprice_all():
+        for step in range(1, 20):
+            for product in products:
+                product.price = 10.0 + step
+                product.quantity = step
+
+    # Цена и количество меняются под той же блокировкой товара, что и
+    # добавление в категорию, поэтому суммы категории не расходятся
+    worker = threading.Thread(target=reprice_all)
+    worker.start()
+    for product in products:
+        category.add_product(product)
+    worker.join()
+    category.verify_aggregates()
+
+
+class TaggedProduct(Product):
+    # Наследник без __slots__: дополнительные поля в словаре экземпляра
+    def __init__(self, name, description, price, quantity, tag):
+        super().__init__(name, description, price, quantity)
+        self.tag = tag
+
+
+def test_product_without_slots_copy_and_pickle():
+    product = TaggedProduct("Телефон", "Смартфон", 1000.0, 5, "новинка")
+    category = Category("Телефоны", "Категория", [product])
+
+    for clone in (
+        copy.copy(product),
+        copy.deepcopy(product),
+        pickle.loads(pickle.dumps(product)),
+    ):
+        assert clone.tag == "новинка"
+        assert (clone.price, clone.quantity) == (1000.0, 5)
+        clone.quantity = 100
+    assert category.calculate_total() == 5
+
+
+def test_category_shallow_copy():
+    product = Product("Телефон", "Смартфон", 1000.0, 5)
+    category = Category("Телефоны", "Категория", [product])
+    clone = copy.copy(category)
+    clone.add_product(Product("Планшет", "Планшет", 500.0, 2))
+
+    # Товары копии не попадают в список оригинала
+    assert category[:] == [product]
+    assert category.calculate_total() == 5
+    category.verify_aggregates()
+    assert clone.calculate_total() == 7
+    clone.verify_aggregates()
+    # Общие товары обновляют суммы обеих категорий
+    product.quantity = 1
+    assert (category.calculate_total(), clone.calculate_total()) == (1, 3)
+
+
+def test_sorted_index_remove_missing_key():
+    product = Product("Телефон", "Смартфон", 1000.0, 5)
+    index = _SortedIndex([product], lambda item: item.price)
+
+    # Устаревшее значение не должно удалять соседний элемент
+    with pytest.raises(RuntimeError):
+        index.remove(product, 999.0)
+    index.remove(product, 1000.0)
+    with pytest.raises(RuntimeError):
+        index.remove(product, 1000.0)
+
+
+def test_enable_indexes_waits_for_stock_lock():
+    product = Product("Телефон", "Смартфон", 1000.0, 5)
+    category = Category("Телефоны", "Категория", [product])
+    lock = _stock_lock(product)
+
+    # Пока изменение остатка не завершено, индексы не строятся
+    lock.acquire()
+    worker = threading.Thread(target=category.enable_indexes)
+    worker.start()
+    worker.join(0.1)
+    assert worker.is_alive()
+    lock.release()
+    worker.join()
+
+    product.price = 1500.0
+    category.verify_aggregates()
+    assert category.products_in_price_range(1500.0, 1500.0) == [product]
@@ -0,0 +1,100 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.category import Category  # noqa: E402
+from src.dataframe import (catalog_to_dataframe,  # noqa: E402
+                           categories_from_dataframe, category_report,
+                           from_dataframe)
+from src.product import LawnGrass, Product, Smartphone  # noqa: E402
+
+
+@pytest.fixture
+def categories():
+    smartphones = Category(
+        "Смартфоны",
+        "Категория смартфонов",
+        [
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray"),
+            Product("Чехол", "Силиконовый чехол", 1000.0, 50),
+        ],
+    )
+    grass = Category(
+        "Газонная трава",
+        "Трава для газона",
+        [LawnGrass("Газон", "Газонная трава", 500.0, 20, "Россия", 7, "Зелёный")],
+    )
+    return [smartphones, grass]
+
+
+def test_catalog_to_dataframe(categories):
+    frame = catalog_to_dataframe(categories)
+
+    assert frame["name"].tolist() == ["Iphone 15", "Чехол", "Газон"]
+    assert frame["type"].tolist() == ["smartphone", "product", "lawn_grass"]
+    assert frame["category"].tolist() == ["Смартфоны", "Смартфоны", "Газонная трава"]
+    assert frame["memory"].tolist() == [512, None, None]
+    assert frame["germination_period"].tolist() == [None, None, 7]
+    assert frame["quantity"].dtype == "int64"
+
+    single = categories[1].to_dataframe()
+    assert single["country"].tolist() == ["Россия"]
+
+
+def test_category_report(categories):
+    report = category_report(catalog_to_dataframe(categories))
+
+    for category in categories:
+        row = report.loc[category.name]
+        assert row["middle_price"] == category.middle_price()
+        assert row["quantity"] == category.calculate_total()
+    assert report.loc["Смартфоны", "stock_value"] == 210000.0 * 8 + 1000.0 * 50
+
+
+def test_from_dataframe_roundtrip(categories):
+    frame = catalog_to_dataframe(categories)
+    # Пропуски в целочисленном столбце превращают его в float
+    frame["memory"] = frame["memory"].astype("float64")
+
+    products = from_dataframe(frame)
+
+    assert [type(p) for p in products] == [Smartphone, Product, LawnGrass]
+    assert products[0].memory == 512
+    assert products[2].country == "Россия"
+
+    restored = categories_from_dataframe(frame)
+    assert [str(c) for c in restored] == [str(c) for c in categories]
+    assert restored[0].description == "Категория смартфонов"
+
+
+def test_categories_from_dataframe_sold_out(categories):
+    categories[0][1].reserve(50)
+    frame = catalog_to_dataframe(categories)
+    frame["memory"] = frame["memory"].astype("float64")
+    assert (frame["quantity"] == 0).sum() == 1
+
+    # Строка с нулевым остатком восстанавливается без ZeroQuantity
+    restored = categories_from_dataframe(frame)
+    assert [p.quantity for p in restored[0]] == [8, 0]
+    assert [str(c) for c in restored] == [str(c) for c in categories]
+
+
+def test_from_dataframe_plain_and_invalid():
+    frame = pd.DataFrame(
+        {
+            "name": ["Клавиатура", "Мышь"],
+            "description": ["Игровая", "Игровая"],
+            "price": [100, 50.0],
+            "quantity": [10, 3],
+        },
+        index=[10, 10],
+    )
+    products = from_dataframe(frame)
+    assert [str(p) for p in products] == [
+        "Клавиатура, 100.0 руб. Остаток: 10",
+        "Мышь, 50.0 руб. Остаток: 3",
+    ]
+
+    frame["quantity"] = [1.5, 3]
+    with pytest.raises(ValueError):
+        from_dataframe(frame)
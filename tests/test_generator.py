@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from src.category import ZeroQuantity
+from src.generator import generate_catalog, generate_file
+from src.product import LawnGrass, Product, Smartphone
+from src.utils import iter_categories_from_jsonl, load_data_from_json
+
+
+def catalog_records(**options):
+    return [
+        (name, description, list(products))
+        for name, description, products in generate_catalog(**options)
+    ]
+
+
+def test_generate_catalog_is_deterministic():
+    first = catalog_records(count=500, categories=3, seed=7)
+
+    assert first == catalog_records(count=500, categories=3, seed=7)
+    assert first != catalog_records(count=500, categories=3, seed=8)
+    # Товары распределены по категориям почти поровну
+    assert [len(products) for _, _, products in first] == [167, 167, 166]
+
+
+def test_generate_catalog_duplicates_and_types():
+    records = [
+        record
+        for _, _, products in generate_catalog(count=1000, categories=2, duplicates=0.3)
+        for record in products
+    ]
+    names = [record["name"] for record in records]
+
+    assert 0 < len(names) - len(set(names)) < 500
+    assert {record.get("type") for record in records} == {
+        None,
+        "smartphone",
+        "lawn_grass",
+    }
+    # Дубль повторяет тип и дополнительные поля исходного товара
+    by_name = {}
+    for record in records:
+        identity = {k: v for k, v in record.items() if k not in ("price", "quantity")}
+        assert by_name.setdefault(record["name"], identity) == identity
+
+
+def test_generate_file_json(tmp_path):
+    path = tmp_path / "catalog.json"
+
+    assert generate_file(path, 300, categories=4, seed=1) == 300
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [category["name"] for category in data] == [
+        f"Категория {i}" for i in range(4)
+    ]
+    catalog = load_data_from_json(path)
+    products = [product for category in catalog for product in category._snapshot()]
+    assert len(products) == 300
+    assert {type(product) for product in products} == {Product, Smartphone, LawnGrass}
+
+
+def test_generate_file_jsonl(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+
+    generate_file(path, 100, "jsonl", categories=3, types=("product",))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 100
+    assert json.loads(lines[0])["category"] == "Категория 0"
+    categories = list(iter_categories_from_jsonl(path))
+    assert [category.name for category in categories] == [
+        "Категория 0",
+        "Категория 1",
+        "Категория 2",
+    ]
+    assert sum(category.category_product_count for category in categories) == 100
+
+
+def test_generate_file_zero_quantity(tmp_path):
+    path = tmp_path / "catalog.json"
+    generate_file(path, 50, categories=1, zero_quantity=0.5)
+
+    # Товары с нулевым остатком не добавляются в категорию
+    with pytest.raises(ZeroQuantity):
+        load_data_from_json(path)
+    with pytest.raises(ValueError):
+        generate_file(path, 10, format="xml")
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import sys
+import threading
+from io import StringIO
+
+import pytest
+
+from src.category import Category
+from src.logger import (BufferedBackend, ConsoleBackend, LogBackend,
+                        LoggingBackend, SilentBackend, get_backend,
+                        set_backend, use_backend)
+from src.product import Product
+
+
+def test_default_backend_is_console():
+    assert isinstance(get_backend(), ConsoleBackend)
+
+
+def test_silent_backend():
+    original_stdout = sys.stdout
+    sys.stdout = StringIO()
+    # Ни создание продукта, ни добавление в категорию ничего не печатают
+    with use_backend(SilentBackend()):
+        product = Product("Продукт", "Описание", 100.0, 10)
+        Category("Категория", "Описание", [product])
+    output = sys.stdout.getvalue()
+    sys.stdout = original_stdout
+
+    assert output == ""
+    assert isinstance(get_backend(), ConsoleBackend)
+
+
+def test_buffered_backend():
+    backend = BufferedBackend()
+    with use_backend(backend):
+        product = Product("Продукт", "Описание", 100.0, 10)
+        Category("Категория", "Описание", [product])
+
+    assert backend.flush() == [
+        {
+            "event": "product_created",
+            "name": "Продукт",
+            "description": "Описание",
+            "price": 100.0,
+            "quantity": 10,
+        },
+        {"event": "product_added", "name": "Продукт"},
+        {"event": "product_add_finished"},
+    ]
+    assert backend.events == []
+
+
+def test_buffered_backend_sink():
+    batches = []
+    backend = BufferedBackend(max_events=2, sink=batches.append)
+    with use_backend(backend):
+        Product("Продукт1", "Описание", 100.0, 10)
+        Product("Продукт2", "Описание", 100.0, 10)
+        Product("Продукт3", "Описание", 100.0, 10)
+
+    assert [len(batch) for batch in batches] == [2]
+    assert backend.events[0]["name"] == "Продукт3"
+
+
+def test_logging_backend(caplog):
+    with use_backend(LoggingBackend("shop")), caplog.at_level(logging.INFO, "shop"):
+        Product("Продукт", "Описание", 100.0, 10)
+
+    assert caplog.records[0].event == "product_created"
+    assert caplog.records[0].getMessage() == (
+        "Создан объект класса 'Продукт', описание: 'Описание', цена: 100.0, кол-во 10"
+    )
+
+
+def test_set_backend():
+    previous = set_backend(SilentBackend())
+    try:
+        assert isinstance(get_backend(), SilentBackend)
+    finally:
+        set_backend(previous)
+
+    with pytest.raises(ValueError):
+        set_backend(print)
+
+    with pytest.raises(ValueError):
+        with use_backend(print):
+            pass
+    # Приёмник без emit создать нельзя
+    with pytest.raises(TypeError):
+        LogBackend()
+
+
+def test_use_backend_is_per_context():
+    seen = []
+    backend = BufferedBackend()
+
+    # Приёмник из use_backend не виден в других потоках
+    with use_backend(backend):
+        thread = threading.Thread(target=lambda: seen.append(get_backend()))
+        thread.start()
+        thread.join()
+        assert get_backend() is backend
+    assert isinstance(seen[0], ConsoleBackend)
+
+    # и в других задачах asyncio
+    async def task(name, started, finished):
+        if name == "buffered":
+            with use_backend(backend):
+                started.set()
+                await finished.wait()
+                Product("Продукт", "Описание", 100.0, 10)
+        else:
+            await started.wait()
+            seen.append(get_backend())
+            finished.set()
+
+    async def main():
+        started, finished = asyncio.Event(), asyncio.Event()
+        await asyncio.gather(
+            task("buffered", started, finished), task("other", started, finished)
+        )
+
+    asyncio.run(main())
+    assert isinstance(seen[1], ConsoleBackend)
+    assert [event["event"] for event in backend.flush()] == ["product_created"]
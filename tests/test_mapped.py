@@ -0,0 +1,96 @@
+import pytest
+
+from src.category import Category
+from src.mapped import MappedCatalog
+from src.product import Product
+from src.snapshot import save_snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    categories = [
+        Category(
+            "Смартфоны",
+            "Категория смартфонов",
+            [
+                Product("Iphone 15", "512GB, Gray space", 210000.0, 8),
+                Product("Xiaomi Redmi Note 11", "1024GB, Синий", 31000.0, 14),
+            ],
+        ),
+        Category("Планшеты", "Категория планшетов", []),
+        Category(
+            "Телевизоры", "Категория телевизоров", [Product("QLED", "4K", 123000.0, 7)]
+        ),
+    ]
+    path = tmp_path / "catalog.bin"
+    save_snapshot(categories, path)
+    return path
+
+
+def test_mapped_catalog_aggregates(snapshot_path):
+    total_categories = Category.total_categories
+    total_products = Category.total_products
+
+    with MappedCatalog(snapshot_path) as catalog:
+        assert len(catalog) == 3
+        assert catalog.product_count == 3
+        assert [c.name for c in catalog] == ["Смартфоны", "Планшеты", "Телевизоры"]
+        smartphones = catalog.category("Смартфоны")
+        assert smartphones.description == "Категория смартфонов"
+        assert smartphones.calculate_total() == 22
+        assert smartphones.middle_price() == 120500.0
+        assert catalog[1].middle_price() == 0
+        assert str(catalog[2]) == "Телевизоры, количество продуктов: 7"
+
+    # Открытие снимка не создаёт объектов Category
+    assert Category.total_categories == total_categories
+    assert Category.total_products == total_products
+
+
+def test_mapped_catalog_lazy_products(snapshot_path, capsys):
+    with MappedCatalog(snapshot_path) as catalog:
+        capsys.readouterr()
+        smartphones = catalog[0]
+        # Пока к товарам не обращались, объекты Product не создаются
+        assert capsys.readouterr().out == ""
+
+        product = smartphones[-1]
+        assert isinstance(product, Product)
+        assert str(product) == "Xiaomi Redmi Note 11, 31000.0 руб. Остаток: 14"
+        assert [p.name for p in smartphones] == ["Iphone 15", "Xiaomi Redmi Note 11"]
+        with pytest.raises(IndexError):
+            smartphones[2]
+        with pytest.raises(KeyError):
+            catalog.category("Ноутбуки")
+
+        category = catalog[2].to_category()
+        assert isinstance(category, Category)
+        assert category.calculate_total() == 7
+
+
+def test_mapped_catalog_close(snapshot_path):
+    catalog = MappedCatalog(snapshot_path)
+    catalog.close()
+    catalog.close()
+
+    data = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(data[:-1])
+    with pytest.raises(ValueError, match="контрольная сумма"):
+        MappedCatalog(snapshot_path)
+    snapshot_path.write_bytes(data[:100])
+    with pytest.raises(ValueError, match="обрезан"):
+        MappedCatalog(snapshot_path, verify=False)
+
+
+def test_mapped_category_sold_out_to_category(tmp_path):
+    sold_out = Product("QLED", "4K", 123000.0, 1)
+    category = Category("Телевизоры", "Категория телевизоров", [sold_out])
+    sold_out.reserve(1)
+    path = tmp_path / "catalog.bin"
+    save_snapshot([category], path)
+
+    # Распроданный товар восстанавливается, а не добавляется заново
+    with MappedCatalog(path) as catalog:
+        restored = catalog[0].to_category()
+    assert [p.quantity for p in restored] == [0]
+    assert restored.calculate_total() == 0
@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from src.category import Category, Order, ZeroQuantity, place_orders
+from src.metrics import (DisabledMetrics, MetricsRegistry, get_metrics,
+                         set_metrics, use_metrics)
+from src.product import Product, Smartphone
+from src.utils import load_data_from_json
+
+
+def samples(metrics, name):
+    """{метки в виде кортежа: образец} для метрики name"""
+    return {
+        tuple(sorted(sample["labels"].items())): sample
+        for sample in metrics.to_dict()[name]["samples"]
+    }
+
+
+def test_metrics_disabled_by_default():
+    metrics = get_metrics()
+    items = [1, 2]
+
+    assert isinstance(metrics, DisabledMetrics)
+    assert metrics.enabled is False
+    # Выключенные метрики ничего не оборачивают
+    assert metrics.timed(items, "x") is items
+    with metrics.timer("x"):
+        metrics.inc("x")
+
+
+def test_registry_export():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    metrics.inc("requests_total", method="get")
+    metrics.inc("requests_total", 2, method="get")
+    metrics.observe("latency_seconds", 0.05)
+    metrics.observe("latency_seconds", 0.5)
+    metrics.observe("latency_seconds", 5.0)
+    assert list(metrics.timed([1, 2], "item_seconds")) == [1, 2]
+
+    result = metrics.to_dict()
+    assert result["requests_total"] == {
+        "type": "counter",
+        "samples": [{"labels": {"method": "get"}, "value": 3}],
+    }
+    latency = result["latency_seconds"]["samples"][0]
+    assert latency["count"] == 3
+    assert latency["sum"] == pytest.approx(5.55)
+    assert latency["buckets"] == {0.1: 1, 1.0: 2}
+    assert result["item_seconds"]["samples"][0]["count"] == 2
+
+    text = metrics.to_prometheus()
+    assert "# TYPE requests_total counter\n" in text
+    assert 'requests_total{method="get"} 3\n' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "latency_seconds_count 3\n" in text
+
+    metrics.reset()
+    assert metrics.to_dict() == {}
+    assert metrics.to_prometheus() == ""
+
+
+def test_products_and_orders_instrumented():
+    columns = (["Iphone"], ["Смартфон"], [1.0], [1])
+    fields = {"model": ["15"], "memory": [256], "color": ["Серый"]}
+    with use_metrics(MetricsRegistry()) as metrics:
+        product = Product("Телефон", "Смартфон", 1000.0, 5)
+        with pytest.raises(ValueError):
+            Product("", "Без названия", 1000.0, 5)
+        Smartphone.from_columns(*columns, efficiency=[1.0], **fields)
+        with pytest.raises(ValueError):
+            Smartphone.from_columns(*columns, efficiency=[-1.0], **fields)
+        category = Category("Телефоны", "Категория", [product])
+        with pytest.raises(ZeroQuantity):
+            category.add_product(Product("Пустой", "Нет в наличии", 10.0, 0))
+        order = Order(product, 2)
+        with pytest.raises(ValueError):
+            order.add_product(product, 100)
+        place_orders([(product, 1), (product, 100)], all_or_nothing=False)
+
+    assert get_metrics().enabled is False
+    created = samples(metrics, "products_created_total")
+    assert created[(("type", "Product"),)]["value"] == 2
+    assert created[(("type", "Smartphone"),)]["value"] == 1
+    errors = samples(metrics, "product_validation_errors_total")
+    assert errors[(("type", "Product"),)]["value"] == 1
+    assert errors[(("type", "Smartphone"),)]["value"] == 1
+    assert samples(metrics, "category_products_added_total")[()]["value"] == 1
+    assert samples(metrics, "category_add_rejected_total")[()]["value"] == 1
+    assert samples(metrics, "category_add_product_seconds")[()]["count"] == 1
+    lines = samples(metrics, "order_lines_total")
+    assert lines[(("operation", "add_product"),)]["value"] == 1
+    assert lines[(("operation", "place_orders"),)]["value"] == 1
+    rejected = samples(metrics, "order_rejected_total")
+    assert rejected[(("operation", "add_product"),)]["value"] == 1
+    assert rejected[(("operation", "place_orders"),)]["value"] == 1
+    placed = samples(metrics, "order_place_seconds")
+    assert placed[(("operation", "add_product"),)]["count"] == 2
+
+
+def test_load_data_from_json_phases():
+    with use_metrics(MetricsRegistry()) as metrics:
+        load_data_from_json("data/products.json")
+
+    phases = samples(metrics, "json_load_seconds")
+    assert phases[(("phase", "total"),)]["count"] == 1
+    assert phases[(("phase", "parse"),)]["count"] == 2
+    assert phases[(("phase", "products"),)]["count"] == 2
+    assert phases[(("phase", "category"),)]["count"] == 2
+    assert samples(metrics, "json_load_categories_total")[()]["value"] == 2
+
+
+def test_use_metrics_is_per_thread():
+    seen = []
+    with use_metrics(MetricsRegistry()) as metrics:
+        thread = threading.Thread(target=lambda: seen.append(get_metrics()))
+        thread.start()
+        thread.join()
+        assert get_metrics() is metrics
+    # Другой поток видит глобальные метрики, а не установленные use_metrics
+    assert isinstance(seen[0], DisabledMetrics) and not seen[0].enabled
+
+    registry = MetricsRegistry()
+    previous = set_metrics(registry)
+    try:
+        thread = threading.Thread(target=lambda: seen.append(get_metrics()))
+        thread.start()
+        thread.join()
+    finally:
+        set_metrics(previous)
+    assert seen[1] is registry
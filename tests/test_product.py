@@ -2,8 +2,11 @@ import sys
 from io import StringIO
 from unittest.mock import patch
 
+import pytest
+
+import src.product as product_module
 from src.product import (BaseProduct, LawnGrass, LoggingMixin, Product,
-                         Smartphone)
+                         Smartphone, register_product_type)
 
 
 def test_product_init():
@@ -326,3 +329,287 @@ def test_logging_mixin_multiple_inheritance():
         in test_message
     )
     sys.stdout = original_stdout
+
+
+def test_new_product_with_index():
+    # Словарь {название: товар} используется как индекс
+    index = {}
+    keyboard = Product.new_product(
+        {"name": "Keyboard", "description": "Gaming", "price": 100.0, "quantity": 10},
+        index,
+    )
+    assert index == {"Keyboard": keyboard}
+
+    merged = Product.new_product(
+        {"name": "Keyboard", "description": "Gaming", "price": 120.0, "quantity": 3},
+        index,
+    )
+    assert merged is keyboard
+    assert keyboard.price == 120.0
+    assert keyboard.quantity == 13
+
+    Product.new_product(
+        {"name": "Mouse", "description": "Gaming", "price": 50.0, "quantity": 5}, index
+    )
+    assert list(index) == ["Keyboard", "Mouse"]
+
+
+def test_price_decrease_policy(monkeypatch):
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 10)
+
+    # Политика для одного вызова
+    assert product.set_price(900.0, policy="reject") is False
+    assert product.price == 1000.0
+    assert product.set_price(900.0, policy="approve") is True
+    assert product.price == 900.0
+    assert product.set_price(850.0, policy=lambda p, old, new: new > old * 0.9)
+    assert not product.set_price(500.0, policy=lambda p, old, new: new > old * 0.9)
+    assert product.price == 850.0
+
+    # Глобальная политика не обращается к input()
+    monkeypatch.setattr(Product, "price_decrease_policy", "approve")
+    with patch("builtins.input", side_effect=AssertionError):
+        product.price = 800.0
+    assert product.price == 800.0
+
+
+def test_unknown_price_decrease_policy():
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 10)
+    try:
+        product.set_price(900.0, policy="maybe")
+        assert False, "Должна быть ошибка при неизвестной политике"
+    except ValueError:
+        pass
+
+
+def test_from_records():
+    products = Product.from_records(
+        [
+            {"name": "Keyboard", "description": "Gaming", "price": 100, "quantity": 10},
+            ("Mouse", "Gaming mouse", 50.0, 0),
+        ]
+    )
+
+    assert [str(product) for product in products] == [
+        "Keyboard, 100.0 руб. Остаток: 10",
+        "Mouse, 50.0 руб. Остаток: 0",
+    ]
+    assert all(type(product) is Product for product in products)
+    assert Product.from_records([]) == []
+
+
+def test_from_records_invalid():
+    valid = ("Keyboard", "Gaming", 100.0, 10)
+    for record in [
+        ("", "Gaming", 100.0, 10),
+        ("Keyboard", 1, 100.0, 10),
+        ("Keyboard", "Gaming", "сто", 10),
+        ("Keyboard", "Gaming", 0, 10),
+        ("Keyboard", "Gaming", 100.0, 1.5),
+        ("Keyboard", "Gaming", 100.0, -1),
+    ]:
+        try:
+            Product.from_records([valid, record])
+            assert False, f"Должна быть ошибка для записи {record}"
+        except ValueError:
+            pass
+
+
+def test_from_records_subclass():
+    smartphones = Smartphone.from_records(
+        [
+            {
+                "name": "Iphone 14",
+                "description": "Смартфон",
+                "price": 1000.0,
+                "quantity": 5,
+                "efficiency": 8.5,
+                "model": "14 Pro Max",
+                "memory": 256,
+                "color": "Black",
+            }
+        ]
+    )
+    assert smartphones[0].model == "14 Pro Max"
+
+
+SMARTPHONE_RECORD = {
+    "type": "smartphone",
+    "name": "Iphone 14",
+    "description": "Смартфон",
+    "price": 1000.0,
+    "quantity": 5,
+    "efficiency": 8.5,
+    "model": "14 Pro Max",
+    "memory": 256,
+    "color": "Black",
+}
+GRASS_RECORD = {
+    "type": "lawn_grass",
+    "name": "Газон",
+    "description": "Газонная трава",
+    "price": 500.0,
+    "quantity": 20,
+    "country": "Россия",
+    "germination_period": 7,
+    "color": "Зелёный",
+}
+
+
+def test_from_records_typed():
+    products = Product.from_records(
+        [
+            GRASS_RECORD,
+            ("Mouse", "Gaming mouse", 50.0, 3),
+            SMARTPHONE_RECORD,
+            {"name": "Keyboard", "description": "Gaming", "price": 100, "quantity": 1},
+            {**GRASS_RECORD, "name": "Клевер"},
+        ]
+    )
+
+    # Порядок товаров совпадает с порядком записей
+    assert [type(p) for p in products] == [
+        LawnGrass,
+        Product,
+        Smartphone,
+        Product,
+        LawnGrass,
+    ]
+    assert [p.name for p in products] == [
+        "Газон",
+        "Mouse",
+        "Iphone 14",
+        "Keyboard",
+        "Клевер",
+    ]
+    assert products[2].memory == 256
+    assert products[4].germination_period == 7
+    assert products[0] + products[4] == 500.0 * 20 * 2
+
+
+def test_from_records_typed_invalid():
+    with patch("sys.stdout", new=StringIO()) as output:
+        products = Product.from_records([SMARTPHONE_RECORD])
+    assert "Iphone 14" in output.getvalue()
+    assert len(products) == 1
+
+    for records in [
+        [{**SMARTPHONE_RECORD, "type": "ноутбук"}],
+        [SMARTPHONE_RECORD, {**SMARTPHONE_RECORD, "efficiency": 8}],
+        [GRASS_RECORD, {**GRASS_RECORD, "germination_period": -1}],
+        [GRASS_RECORD, {**GRASS_RECORD, "country": ""}],
+    ]:
+        with patch("sys.stdout", new=StringIO()) as output:
+            with pytest.raises(ValueError):
+                Product.from_records(records)
+        # При ошибке не создаётся ни один товар
+        assert output.getvalue() == ""
+
+    # Тип записи должен наследовать класс, у которого вызван from_records
+    with pytest.raises(ValueError):
+        Smartphone.from_records([GRASS_RECORD])
+    # Запись без поля - ошибка данных, а не KeyError
+    with pytest.raises(ValueError, match="нет поля color"):
+        Product.from_records([{k: v for k, v in GRASS_RECORD.items() if k != "color"}])
+
+
+def test_from_columns_subclass():
+    grass = LawnGrass.from_columns(
+        ["Газон"],
+        ["Газонная трава"],
+        [500.0],
+        [20],
+        country=["Россия"],
+        germination_period=[7],
+        color=["Зелёный"],
+    )
+    assert grass[0].country == "Россия"
+    with pytest.raises(TypeError):
+        LawnGrass.from_columns(["Газон"], ["Газонная трава"], [500.0], [20])
+
+
+def test_register_product_type(monkeypatch):
+    # Регистрация не должна влиять на другие тесты
+    types = dict(product_module._PRODUCT_TYPES)
+    monkeypatch.setattr(product_module, "_PRODUCT_TYPES", types)
+
+    class Book(Product):
+        __slots__ = ("author",)
+
+        def __init__(self, name, description, price, quantity, author):
+            super().__init__(name, description, price, quantity)
+            self.author = author
+
+    # Без field_checks товары создаются конструктором
+    register_product_type("book", Book)
+    book_record = {
+        "type": "book",
+        "name": "Книга",
+        "description": "Роман",
+        "price": 300.0,
+        "quantity": 2,
+        "author": "Автор",
+    }
+    books = Product.from_records([book_record])
+    assert type(books[0]) is Book
+    assert books[0].author == "Автор"
+
+    Book.field_checks = (("author", str, "nonempty", "Автор должен быть строкой"),)
+    register_product_type("book", Book)
+    with pytest.raises(ValueError, match="Автор"):
+        Product.from_records([{**book_record, "author": ""}])
+
+    with pytest.raises(ValueError):
+        register_product_type("dict", dict)
+
+
+def test_base_product_init_in_slotted_subclass():
+    class Item(BaseProduct):
+        __slots__ = ("_price", "quantity")
+
+        def __init__(self, name, description, price, quantity):
+            super().__init__(name, description, price, quantity)
+            self._price = float(price)
+            self.quantity = quantity
+
+        def __str__(self):
+            return self.name
+
+        def __add__(self, other):
+            return self._price * self.quantity + other._price * other.quantity
+
+        @property
+        def price(self):
+            return self._price
+
+        @classmethod
+        def new_product(cls, product_data, products=None):
+            return cls(**product_data)
+
+    # Общий конструктор заполняет только поля со слотами BaseProduct
+    item = Item("Товар", "Описание", 100, 2)
+    assert (item.name, item.description, item.price, item.quantity) == (
+        "Товар",
+        "Описание",
+        100.0,
+        2,
+    )
+    with pytest.raises(ValueError):
+        Item("", "Описание", 100, 2)
+
+
+def test_products_use_slots():
+    products = [
+        Product("Телефон", "Смартфон", 1000.0, 5),
+        Smartphone("Iphone", "Смартфон", 1000.0, 5, 8.5, "14", 256, "Black"),
+        LawnGrass("Газон", "Газонная трава", 500.0, 20, "Россия", 7, "Зелёный"),
+    ]
+
+    for product in products:
+        # Атрибуты хранятся в слотах, словаря экземпляра нет
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(AttributeError):
+            product.unknown = 1
+        # Приватные поля по-прежнему доступны через искажённое имя
+        assert product._Product__price == product.price
+        assert product._Product__quantity == product.quantity
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from src.category import Category
+from src.logger import SilentBackend, use_backend
+from src.product import Product
+from src.service import InventoryService
+
+
+def test_concurrent_place_order_load():
+    products = [
+        Product(f"Товар {i}", "Описание", 100.0 * (i + 1), 300) for i in range(3)
+    ]
+    category = Category("Распродажа", "Товары распродажи", products)
+    service = InventoryService()
+
+    async def confirm(order):
+        # Имитация ожидания платёжного сервиса, пока товар заблокирован
+        await asyncio.sleep(0)
+
+    async def buyer(number):
+        try:
+            await service.place_order(products[number % 3], 1 + number % 2, confirm)
+        except ValueError:
+            return 0
+        return 1 + number % 2
+
+    async def main():
+        return await asyncio.gather(*(buyer(n) for n in range(5000)))
+
+    with use_backend(SilentBackend()):
+        sold = asyncio.run(main())
+
+    assert sum(sold) == 900
+    assert all(product.quantity >= 0 for product in products)
+    assert category.calculate_total() == 0
+
+
+def test_failed_confirmation_restocks():
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 5)
+    service = InventoryService()
+
+    async def decline(order):
+        raise RuntimeError("Оплата отклонена")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.place_order(product, 2, decline))
+    assert product.quantity == 5
+
+
+def test_reserve_add_product_and_set_price():
+    product = Product("Смартфон", "Современный смартфон", 1000.0, 5)
+    category = Category("Смартфоны", "Категория смартфонов", [])
+    service = InventoryService()
+
+    async def main():
+        await service.add_product(category, product)
+        await service.reserve(product, 2)
+        # Понижение цены по умолчанию отклоняется без обращения к input()
+        return await service.set_price(product, 900.0)
+
+    assert asyncio.run(main()) is False
+    assert product.price == 1000.0
+    assert category.calculate_total() == 3
+    with pytest.raises(ValueError):
+        asyncio.run(service.reserve(product, 10))
+
+
+def test_order_locks_are_per_product():
+    service = InventoryService()
+    phone = Product("Телефон", "Смартфон", 1000.0, 5)
+    case = Product("Чехол", "Чехол для смартфона", 10.0, 5)
+    confirmed = []
+
+    async def confirm_with_case(order):
+        # Подтверждение заказывает другой товар через тот же сервис
+        await service.place_order(case, 1, confirm_case)
+        confirmed.append("phone")
+
+    async def confirm_case(order):
+        confirmed.append("case")
+
+    async def slow_confirm(order):
+        await asyncio.sleep(0.05)
+        confirmed.append("slow")
+
+    async def main():
+        # Пока подтверждается первый заказ телефона, заказы чехла проходят
+        await asyncio.gather(
+            service.place_order(phone, 1, slow_confirm),
+            service.place_order(phone, 1, confirm_with_case),
+            service.place_order(case, 1, confirm_case),
+        )
+
+    with use_backend(SilentBackend()):
+        asyncio.run(asyncio.wait_for(main(), 1))
+
+    assert confirmed == ["case", "slow", "case", "phone"]
+    assert (phone.quantity, case.quantity) == (3, 3)
+    # Записи блокировок удаляются, когда их отпускает последняя корутина
+    assert service._locks == {}
@@ -0,0 +1,117 @@
+import pytest
+
+from src.category import Category, Order
+from src.mapped import MappedCatalog
+from src.product import LawnGrass, Product, Smartphone
+from src.snapshot import HEADER, load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def categories():
+    return [
+        Category(
+            "Смартфоны",
+            "Категория смартфонов",
+            [
+                Product("Iphone 15", "512GB, Gray space", 210000.0, 8),
+                Product("Xiaomi Redmi Note 11", "1024GB, Синий", 31000.0, 14),
+            ],
+        ),
+        Category("Планшеты", "Категория планшетов", []),
+        Category(
+            "Телевизоры", "Категория телевизоров", [Product("QLED", "4K", 123000.0, 7)]
+        ),
+    ]
+
+
+def test_snapshot_roundtrip(tmp_path, categories):
+    path = tmp_path / "catalog.bin"
+    save_snapshot(categories, path)
+    total_categories = Category.total_categories
+    total_products = Category.total_products
+
+    loaded = load_snapshot(path)
+
+    assert [(c.name, c.description) for c in loaded] == [
+        (c.name, c.description) for c in categories
+    ]
+    assert [c.products for c in loaded] == [c.products for c in categories]
+    assert [c.middle_price() for c in loaded] == [c.middle_price() for c in categories]
+    assert Category.total_categories == total_categories + 3
+    assert Category.total_products == total_products + 3
+
+
+def test_snapshot_checksum(tmp_path, categories):
+    path = tmp_path / "catalog.bin"
+    save_snapshot(categories, path)
+    data = bytearray(path.read_bytes())
+    data[HEADER.size + 20] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="контрольная сумма"):
+        load_snapshot(path)
+
+
+def test_snapshot_header(tmp_path, categories):
+    path = tmp_path / "catalog.bin"
+    save_snapshot(categories, path)
+    data = path.read_bytes()
+
+    path.write_bytes(b"JSON" + data[4:])
+    with pytest.raises(ValueError, match="неизвестный формат"):
+        load_snapshot(path)
+
+    path.write_bytes(data[:4] + b"\x63\x00" + data[6:])
+    with pytest.raises(ValueError, match="версия"):
+        load_snapshot(path)
+
+    path.write_bytes(data[:10])
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+
+def test_snapshot_typed_products(tmp_path):
+    smartphone = Smartphone("Iphone", "Смартфон", 1000.0, 5, 8.5, "14", 256, "Black")
+    grass = LawnGrass("Газон", "Газонная трава", 500.0, 20, "Россия", 7, "Зелёный")
+    product = Product("Чехол", "Чехол для смартфона", 10.0, 3)
+    category = Category("Смешанная", "Разные товары", [smartphone, grass, product])
+    path = tmp_path / "catalog.bin"
+    save_snapshot([category], path)
+
+    # Тип и дополнительные поля наследников сохраняются, порядок тоже
+    loaded = load_snapshot(path)[0][:]
+    assert [type(p) for p in loaded] == [Smartphone, LawnGrass, Product]
+    assert (loaded[0].model, loaded[0].memory, loaded[0].color) == ("14", 256, "Black")
+    assert loaded[0].efficiency == 8.5
+    assert (loaded[1].country, loaded[1].germination_period) == ("Россия", 7)
+    with MappedCatalog(path) as catalog:
+        assert type(catalog[0][0]) is Smartphone
+        assert catalog[0][1].color == "Зелёный"
+
+    # Товар без field_checks: дополнительные поля неизвестны
+    class Book(Product):
+        __slots__ = ("author",)
+
+        def __init__(self, name, description, price, quantity, author):
+            super().__init__(name, description, price, quantity)
+            self.author = author
+
+    book = Book("Книга", "Роман", 300.0, 2, "Автор")
+    with pytest.raises(ValueError, match="field_checks"):
+        save_snapshot([Category("Книги", "Книги", [book])], path)
+
+
+def test_snapshot_sold_out_product(tmp_path):
+    sold_out = Product("Iphone 15", "512GB, Gray space", 210000.0, 2)
+    category = Category("Смартфоны", "Категория смартфонов", [sold_out])
+    Order(sold_out, 2)
+    path = tmp_path / "catalog.bin"
+    save_snapshot([category], path)
+    total_products = Category.total_products
+
+    # Восстановление снимка - не добавление товара: ZeroQuantity нет
+    loaded = load_snapshot(path)[0]
+    assert [p.quantity for p in loaded] == [0]
+    assert loaded.calculate_total() == 0
+    loaded.verify_aggregates()
+    assert Category.total_products == total_products + 1
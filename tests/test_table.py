@@ -0,0 +1,110 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.category import Category  # noqa: E402
+from src.product import Product  # noqa: E402
+from src.table import ProductTable  # noqa: E402
+
+
+@pytest.fixture
+def categories():
+    smartphones = Category(
+        "Смартфоны",
+        "Категория смартфонов",
+        [
+            Product("Iphone 15", "512GB, Gray space", 210000.0, 8),
+            Product("Xiaomi Redmi Note 11", "1024GB, Синий", 31000.0, 14),
+        ],
+    )
+    tvs = Category(
+        "Телевизоры", "Категория телевизоров", [Product("QLED", "4K", 123000.0, 7)]
+    )
+    return [smartphones, tvs]
+
+
+def test_from_categories(categories):
+    table = ProductTable.from_categories(categories)
+
+    assert len(table) == 3
+    assert table.categories == [
+        ("Смартфоны", "Категория смартфонов"),
+        ("Телевизоры", "Категория телевизоров"),
+    ]
+    assert table.category_ids.tolist() == [0, 0, 1]
+    assert table.middle_price(0) == categories[0].middle_price()
+    assert table.calculate_total(0) == categories[0].calculate_total()
+    assert table.calculate_total() == 29
+    assert table.middle_prices().tolist() == [120500.0, 123000.0]
+
+
+def test_stock_value(categories):
+    table = ProductTable.from_categories(categories)
+    iphone, xiaomi = table[0], table[1]
+
+    assert table.stock_value(0) == iphone + xiaomi
+    assert table.stock_value() == 210000.0 * 8 + 31000.0 * 14 + 123000.0 * 7
+
+
+def test_where_and_filter(categories):
+    table = ProductTable.from_categories(categories)
+
+    expensive = table.where(min_price=100000.0)
+    assert expensive.names.tolist() == ["Iphone 15", "QLED"]
+    assert table.where(max_quantity=7).names.tolist() == ["QLED"]
+    assert table.filter(lambda t: t.quantities > 10).names.tolist() == [
+        "Xiaomi Redmi Note 11"
+    ]
+    assert table.where(min_price=1e9).middle_price() == 0
+
+
+def test_lazy_products(categories):
+    table = ProductTable.from_categories(categories)
+
+    product = table[-1]
+    assert isinstance(product, Product)
+    assert str(product) == "QLED, 123000.0 руб. Остаток: 7"
+    assert [p.name for p in table] == ["Iphone 15", "Xiaomi Redmi Note 11", "QLED"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_to_categories(categories):
+    restored = ProductTable.from_categories(categories).to_categories()
+
+    assert [str(category) for category in restored] == [
+        str(category) for category in categories
+    ]
+
+
+def test_to_categories_sold_out(categories):
+    categories[1][0].reserve(7)
+
+    # Распроданный товар восстанавливается без ZeroQuantity
+    restored = ProductTable.from_categories(categories).to_categories()
+    assert [p.quantity for p in restored[1]] == [0]
+    assert restored[1].calculate_total() == 0
+
+
+def test_from_json():
+    total_categories = Category.total_categories
+
+    table = ProductTable.from_json("data/products.json")
+
+    # Объекты Category при загрузке не создаются
+    assert Category.total_categories == total_categories
+    assert len(table) == 4
+    assert table.categories[1][0] == "Телевизоры"
+    assert table.calculate_total(0) == 27
+    assert table.middle_price(1) == 123000.0
+
+
+def test_invalid_columns():
+    with pytest.raises(ValueError):
+        ProductTable(["Товар"], ["Описание"], [-1.0], [1])
+    with pytest.raises(ValueError):
+        ProductTable(["Товар"], ["Описание"], [1.0], [1.5])
+    with pytest.raises(ValueError):
+        ProductTable([""], ["Описание"], [1.0], [1])
+    with pytest.raises(ValueError):
+        ProductTable(["Товар"], ["Описание"], [1.0, 2.0], [1])
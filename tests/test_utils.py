@@ -0,0 +1,394 @@
+import copy
+import json
+
+import pytest
+
+from src.category import Category, CategoryIterator, ZeroQuantity
+from src.product import Product, Smartphone
+from src.utils import (Catalog, iter_categories_from_json, load_data_from_files,
+                       load_data_from_json, reload_catalog)
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Категория смартфонов",
+        "products": [
+            {
+                "name": "Iphone 15",
+                "description": "512GB, Gray space",
+                "price": 210000.0,
+                "quantity": 8,
+            },
+            {
+                "name": "Xiaomi Redmi Note 11",
+                "description": "1024GB, Синий",
+                "price": 31000,
+                "quantity": 14,
+            },
+        ],
+    },
+    {
+        "name": "Телевизоры",
+        "description": "Категория телевизоров",
+        "products": [
+            {
+                "name": '55" QLED 4K',
+                "description": "Фоновая подсветка",
+                "price": 123000.0,
+                "quantity": 7,
+            }
+        ],
+    },
+    {"products": [], "description": "Пустая категория", "name": "Планшеты"},
+]
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / "products.json"
+    path.write_text(json.dumps(CATALOG, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def test_load_data_from_json():
+    catalog = load_data_from_json("data/products.json")
+
+    assert catalog.names == ["Смартфоны", "Телевизоры"]
+    assert len(catalog) == 2
+    assert all(isinstance(category, Category) for category in catalog)
+
+
+def test_catalog_lookups(catalog_file):
+    catalog = load_data_from_json(catalog_file)
+
+    assert catalog["Телевизоры"] is catalog.categories[1]
+    assert catalog["Планшеты"].category_product_count == 0
+    assert catalog.product("Iphone 15").quantity == 8
+    assert catalog.products_by_name['55" QLED 4K'].price == 123000.0
+    with pytest.raises(KeyError):
+        catalog["Ноутбуки"]
+    with pytest.raises(KeyError):
+        catalog.product("Ноутбук")
+
+
+def test_catalog_keeps_first_occurrence():
+    first = Product("Товар", "Первый", 100.0, 1)
+    second = Product("Товар", "Второй", 200.0, 2)
+    catalog = Catalog(
+        [
+            Category("Склад", "Основной склад", [first]),
+            Category("Склад", "Резервный склад", [second]),
+        ]
+    )
+
+    assert len(catalog) == 2
+    assert catalog["Склад"].description == "Основной склад"
+    assert catalog.product("Товар") is first
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_categories_from_json(catalog_file, chunk_size):
+    # Проверяем разбор при любых границах порций чтения
+    categories = list(iter_categories_from_json(catalog_file, chunk_size=chunk_size))
+
+    assert [category.name for category in categories] == [
+        "Смартфоны",
+        "Телевизоры",
+        "Планшеты",
+    ]
+    assert all(isinstance(category, Category) for category in categories)
+    assert categories[0].get_product_info == (
+        "Iphone 15, 210000.0 руб. Остаток: 8 шт.\n"
+        "Xiaomi Redmi Note 11, 31000.0 руб. Остаток: 14 шт.\n"
+    )
+    assert categories[1].calculate_total() == 7
+    assert categories[2].category_product_count == 0
+
+
+def test_iter_categories_from_json_is_lazy(catalog_file):
+    categories = iter_categories_from_json(catalog_file, chunk_size=16)
+    before = Category.total_categories
+
+    first = next(categories)
+
+    # Создана только первая категория
+    assert first.name == "Смартфоны"
+    assert Category.total_categories == before + 1
+
+
+def test_iter_categories_from_json_invalid(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"name": "Смартфоны", "description": "x", "products": [', "utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_categories_from_json(path))
+
+
+def test_load_data_from_files(tmp_path, catalog_file):
+    second = tmp_path / "shard_2.json"
+    second.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "Смартфоны",
+                    "description": "Категория смартфонов",
+                    "products": [
+                        {
+                            "name": "Samsung Galaxy C23 Ultra",
+                            "description": "256GB, Серый цвет",
+                            "price": 180000.0,
+                            "quantity": 5,
+                        }
+                    ],
+                }
+            ]
+        ),
+        encoding="utf-8",
+    )
+    broken = tmp_path / "shard_3.json"
+    broken.write_text('[{"name": "Ноутбуки", "description": "x", "products": [{"name": ""}]}]')
+    total_categories = Category.total_categories
+    total_products = Category.total_products
+
+    categories, errors = load_data_from_files(
+        [catalog_file, second, broken], max_workers=2
+    )
+
+    # Одноимённые категории из разных шардов объединены
+    assert [category.name for category in categories] == [
+        "Смартфоны",
+        "Телевизоры",
+        "Планшеты",
+    ]
+    assert categories[0].category_product_count == 3
+    assert Category.total_categories == total_categories + 3
+    assert Category.total_products == total_products + 4
+    # Ошибка в одном шарде не останавливает загрузку
+    assert list(errors) == [str(broken)]
+
+
+def test_load_data_from_files_glob(tmp_path, catalog_file):
+    categories, errors = load_data_from_files(str(tmp_path / "*.json"))
+
+    assert len(categories) == 3
+    assert errors == {}
+    assert load_data_from_files(str(tmp_path / "*.csv")) == ([], {})
+
+
+def test_load_data_from_files_zero_quantity_shard(tmp_path):
+    def product(name, quantity):
+        return {"name": name, "description": "x", "price": 10.0, "quantity": quantity}
+
+    first = tmp_path / "shard_1.json"
+    first.write_text(
+        json.dumps([{"name": "A", "description": "A", "products": [product("p1", 1)]}])
+    )
+    second = tmp_path / "shard_2.json"
+    second.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "A",
+                    "description": "A",
+                    "products": [product("p2", 1), product("p3", 0)],
+                },
+                {"name": "B", "description": "B", "products": [product("p4", 1)]},
+            ]
+        )
+    )
+    total_products = Category.total_products
+
+    categories, errors = load_data_from_files([first, second], max_workers=2)
+
+    # Шард с нулевым количеством отклонён целиком, без частичного объединения
+    assert list(errors) == [str(second)]
+    assert [category.name for category in categories] == ["A"]
+    assert [product.name for product in categories[0]] == ["p1"]
+    assert Category.total_products == total_products + 1
+
+
+def test_reload_catalog(catalog_file):
+    catalog = load_data_from_json(catalog_file)
+    iphone = catalog.product("Iphone 15")
+    tv = catalog.product('55" QLED 4K')
+    total_categories = Category.total_categories
+    total_products = Category.total_products
+
+    changed = copy.deepcopy(CATALOG)
+    # Смартфоны: Xiaomi удалён, у Iphone изменились цена и остаток, добавлен Samsung
+    changed[0]["products"] = [
+        {
+            "name": "Iphone 15",
+            "description": "512GB, Gray space",
+            "price": 199000.0,
+            "quantity": 3,
+        },
+        {
+            "name": "Samsung Galaxy C23 Ultra",
+            "description": "256GB, Серый цвет",
+            "price": 180000.0,
+            "quantity": 5,
+        },
+    ]
+    # Планшеты удалены, добавлены Ноутбуки
+    changed[2] = {
+        "name": "Ноутбуки",
+        "description": "Категория ноутбуков",
+        "products": [
+            {"name": "MacBook", "description": "M3", "price": 150000.0, "quantity": 2}
+        ],
+    }
+    catalog_file.write_text(json.dumps(changed, ensure_ascii=False), encoding="utf-8")
+
+    result = reload_catalog(catalog, catalog_file)
+
+    assert result == {
+        "categories_added": ["Ноутбуки"],
+        "categories_removed": ["Планшеты"],
+        "added": [("Смартфоны", "Samsung Galaxy C23 Ultra")],
+        "removed": [("Смартфоны", "Xiaomi Redmi Note 11")],
+        "changed": [("Смартфоны", "Iphone 15")],
+    }
+    assert catalog.names == ["Смартфоны", "Телевизоры", "Ноутбуки"]
+    # Неизменённые объекты сохраняются, изменённые обновлены на месте
+    assert catalog.product("Iphone 15") is iphone
+    assert catalog.product('55" QLED 4K') is tv
+    assert iphone.price == 199000.0
+    assert catalog["Смартфоны"].calculate_total() == 8
+    catalog["Смартфоны"].verify_aggregates()
+    assert "Xiaomi Redmi Note 11" not in catalog.products_by_name
+    assert catalog.product("MacBook").quantity == 2
+    # Счётчики: -1 категория +1 категория, -1 товар +1 товар +1 товар
+    assert Category.total_categories == total_categories
+    assert Category.total_products == total_products + 1
+
+    # Повторная загрузка того же файла ничего не меняет
+    assert reload_catalog(catalog, catalog_file) == {
+        "categories_added": [],
+        "categories_removed": [],
+        "added": [],
+        "removed": [],
+        "changed": [],
+    }
+    assert Category.total_products == total_products + 1
+
+
+def test_reload_catalog_duplicate_product_names(catalog_file):
+    first = {"name": "Товар", "description": "Первый", "price": 100.0, "quantity": 1}
+    second = {"name": "Товар", "description": "Второй", "price": 200.0, "quantity": 2}
+    data = [{"name": "Склад", "description": "Склад", "products": [first, second]}]
+    catalog_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    catalog = load_data_from_json(catalog_file)
+    first_product, second_product = CategoryIterator(catalog["Склад"])
+
+    data[0]["products"] = [second]
+    catalog_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    result = reload_catalog(catalog, catalog_file)
+
+    # Товары с одинаковым названием сопоставляются по порядку вхождения:
+    # первый обновлён данными второго, второй удалён
+    assert result["changed"] == [("Склад", "Товар")]
+    assert result["removed"] == [("Склад", "Товар")]
+    assert list(CategoryIterator(catalog["Склад"])) == [first_product]
+    assert catalog.product("Товар") is first_product
+    assert first_product.price == 200.0
+    # Удалённый товар больше не влияет на суммы категории
+    second_product.quantity = 100
+    assert catalog["Склад"].calculate_total() == 2
+
+
+def test_reload_catalog_zero_quantity(catalog_file):
+    catalog = load_data_from_json(catalog_file)
+    iphone = catalog.product("Iphone 15")
+    total_products = Category.total_products
+
+    changed = copy.deepcopy(CATALOG)
+    changed[0]["products"][0]["price"] = 199000.0
+    changed[0]["products"].append(
+        {"name": "Пустой", "description": "Нет в наличии", "price": 1.0, "quantity": 0}
+    )
+    changed.append({"name": "Новая", "description": "Категория", "products": []})
+    catalog_file.write_text(json.dumps(changed, ensure_ascii=False), encoding="utf-8")
+
+    with pytest.raises(ZeroQuantity):
+        reload_catalog(catalog, catalog_file)
+
+    # Файл проверяется целиком до изменений: каталог остался прежним
+    assert catalog.names == [category["name"] for category in CATALOG]
+    assert iphone.price == CATALOG[0]["products"][0]["price"]
+    assert "Пустой" not in catalog.products_by_name
+    assert [p.name for p in catalog["Смартфоны"]] == [
+        p["name"] for p in CATALOG[0]["products"]
+    ]
+    assert Category.total_products == total_products
+
+    # После исправления файла перезагрузка проходит
+    changed[0]["products"][-1]["quantity"] = 1
+    catalog_file.write_text(json.dumps(changed, ensure_ascii=False), encoding="utf-8")
+    result = reload_catalog(catalog, catalog_file)
+    assert result["added"] == [("Смартфоны", "Пустой")]
+    assert result["categories_added"] == ["Новая"]
+    assert iphone.price == 199000.0
+
+
+def test_load_typed_products(catalog_file):
+    smartphone = {
+        "type": "smartphone",
+        "name": "Iphone 15",
+        "description": "512GB, Gray space",
+        "price": 210000.0,
+        "quantity": 8,
+        "efficiency": 98.2,
+        "model": "15",
+        "memory": 512,
+        "color": "Gray space",
+    }
+    data = copy.deepcopy(CATALOG)
+    data[0]["products"][0] = smartphone
+    catalog_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    catalog = load_data_from_json(catalog_file)
+
+    assert isinstance(catalog.product("Iphone 15"), Smartphone)
+    assert type(catalog.product("Xiaomi Redmi Note 11")) is Product
+
+    # Смена дополнительного поля пересоздаёт товар нужного класса
+    data[0]["products"][0] = {**smartphone, "memory": 1024}
+    catalog_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    result = reload_catalog(catalog, catalog_file)
+
+    assert result["changed"] == [("Смартфоны", "Iphone 15")]
+    assert result["added"] == result["removed"] == []
+    assert catalog.product("Iphone 15").memory == 1024
+    assert catalog["Смартфоны"].category_product_count == 2
+
+
+def test_reload_catalog_missing_field(catalog_file):
+    smartphone = {
+        "type": "smartphone",
+        "name": "Iphone 15",
+        "description": "512GB, Gray space",
+        "price": 210000.0,
+        "quantity": 8,
+        "efficiency": 98.2,
+        "model": "15",
+        "memory": 512,
+        "color": "Gray space",
+    }
+    data = copy.deepcopy(CATALOG)
+    data[0]["products"][0] = smartphone
+    catalog_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    catalog = load_data_from_json(catalog_file)
+
+    # Запись без обязательного поля - ошибка данных, а не KeyError
+    for field, position in [("quantity", 1), ("memory", 0), ("name", 0)]:
+        bad = copy.deepcopy(data)
+        del bad[0]["products"][position][field]
+        catalog_file.write_text(json.dumps(bad, ensure_ascii=False), encoding="utf-8")
+        with pytest.raises(ValueError, match=f"нет поля {field}"):
+            reload_catalog(catalog, catalog_file)
+        with pytest.raises(ValueError, match=f"нет поля {field}"):
+            load_data_from_json(catalog_file)
+
+    assert catalog.product("Iphone 15").memory == 512
+    assert catalog["Смартфоны"].category_product_count == 2